@@ -0,0 +1,42 @@
+"""composite indexes for per-user budget and cash_flow scans
+
+Revision ID: 0020
+Revises: 0019
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0020"
+down_revision = "0019"
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = (
+    ("ix_budget_user_type_date", "budget", ["user_id", "type", "date"]),
+    ("ix_cash_flow_user_date", "cash_flow", ["user_id", "date"]),
+)
+
+
+def _existing_indexes(table):
+    insp = sa.inspect(op.get_bind())
+    # init_db() may already have created these indexes (or not the table yet).
+    if table not in insp.get_table_names():
+        return None
+    return {ix["name"] for ix in insp.get_indexes(table)}
+
+
+def upgrade():
+    for name, table, columns in _INDEXES:
+        existing = _existing_indexes(table)
+        if existing is None or name in existing:
+            continue
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _columns in reversed(_INDEXES):
+        existing = _existing_indexes(table)
+        if existing and name in existing:
+            op.drop_index(name, table)
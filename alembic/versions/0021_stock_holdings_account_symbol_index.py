@@ -0,0 +1,41 @@
+"""composite index for account-scoped stock_holdings lookups
+
+Revision ID: 0021
+Revises: 0020
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0021"
+down_revision = "0020"
+branch_labels = None
+depends_on = None
+
+
+_INDEX = "ix_stock_holdings_user_account_symbol"
+
+
+def _existing_indexes():
+    insp = sa.inspect(op.get_bind())
+    # stock_holdings is created by init_db(), not by an earlier revision.
+    if "stock_holdings" not in insp.get_table_names():
+        return None
+    return {ix["name"] for ix in insp.get_indexes("stock_holdings")}
+
+
+def upgrade():
+    existing = _existing_indexes()
+    if existing is None or _INDEX in existing:
+        return
+    op.create_index(
+        _INDEX,
+        "stock_holdings",
+        ["user_id", "account_id", "symbol"],
+    )
+
+
+def downgrade():
+    existing = _existing_indexes()
+    if existing and _INDEX in existing:
+        op.drop_index(_INDEX, "stock_holdings")
@@ -130,13 +130,34 @@ app.include_router(admin.router)
 
 
 # ── Health ────────────────────────────────────────────────────────────────────
+# Probes (load balancer, front-end status checks) can arrive many times a
+# second; the per-DB ping result is reused for a few seconds.
+_HEALTH_TTL = 5.0
+_health_cache: tuple[float, Dict[str, Any]] | None = None
+_health_lock = threading.Lock()
+
+
 @app.get("/health", tags=["meta"], response_model=None)
 def health() -> Dict[str, Any] | JSONResponse:
     """Liveness + readiness probe: pings all 5 SQLite databases.
 
     Returns 200 if every database responds to SELECT 1.
     Returns 503 if any database is unreachable, with per-DB status in the body.
+    The result is cached for ``_HEALTH_TTL`` seconds.
     """
+    global _health_cache
+    with _health_lock:
+        cached = _health_cache
+        if cached is None or time.monotonic() - cached[0] >= _HEALTH_TTL:
+            cached = (time.monotonic(), _probe_databases())
+            _health_cache = cached
+    payload = dict(cached[1])
+    if payload["status"] != "healthy":
+        return JSONResponse(status_code=503, content=payload)
+    return payload
+
+
+def _probe_databases() -> Dict[str, Any]:
     _db_factories = {
         "users":     get_users_session,
         "trades":    get_trades_session,
@@ -161,8 +182,4 @@ def health() -> Dict[str, Any] | JSONResponse:
             session.close()
 
     overall = "unhealthy" if any_down else "healthy"
-    payload: Dict[str, Any] = {"status": overall, "databases": db_status}
-
-    if any_down:
-        return JSONResponse(status_code=503, content=payload)
-    return payload
+    return {"status": overall, "databases": db_status}
@@ -27,6 +27,38 @@ from ..deps import get_current_user
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def _client_meta(request: Request) -> tuple[str | None, str | None]:
+    """Return the caller's (ip, user_agent), normalised once per request."""
+    host = getattr(getattr(request, "client", None), "host", None)
+    return (str(host) if host else None), request.headers.get("user-agent")
+
+
+def _revoke_access_token(user: Dict[str, Any], user_id: int) -> None:
+    """Revoke the presented access token's jti until it would have expired."""
+    jti = str(user.get("jti") or "").strip()
+    if not jti:
+        return
+    try:
+        exp_dt = datetime.fromtimestamp(int(user["exp"]), tz=timezone.utc)
+    except Exception:
+        exp_dt = datetime.now(timezone.utc)
+    services.revoke_token(user_id=user_id, jti=jti, expires_at=exp_dt)
+
+
+def _issue_tokens(
+    *, user_id: int, username: str, role: str, refresh_token: str,
+    issued_at: datetime | None = None,
+) -> AuthResponse:
+    """Mint an access token for the user and wrap it with the refresh token."""
+    token = create_access_token(
+        subject=str(user_id), extra={"username": username, "role": role}, issued_at=issued_at
+    )
+    return AuthResponse(
+        access_token=token, refresh_token=refresh_token,
+        user_id=user_id, username=username, role=role,
+    )
+
+
 @router.post("/signup", response_model=AuthResponse)
 def signup(req: AuthSignupRequest, request: Request) -> AuthResponse:
     # Registration is currently closed.
@@ -36,14 +68,13 @@ def signup(req: AuthSignupRequest, request: Request) -> AuthResponse:
 @router.post("/login", response_model=AuthResponse)
 def login(req: AuthLoginRequest, request: Request) -> AuthResponse:
     username = str(req.username).strip().lower()
-    ip = getattr(getattr(request, "client", None), "host", None)
-    ua = request.headers.get("user-agent")
+    ip, ua = _client_meta(request)
 
     try:
-        if services.is_login_rate_limited(username=username, ip=str(ip) if ip else None):
+        if services.is_login_rate_limited(username=username, ip=ip):
             services.log_auth_event(
                 event_type="login_throttled", success=False,
-                username=username, ip=str(ip) if ip else None, user_agent=ua,
+                username=username, ip=ip, user_agent=ua,
             )
             raise HTTPException(status_code=429, detail="Too many login attempts. Please try again later.")
     except HTTPException:
@@ -55,36 +86,29 @@ def login(req: AuthLoginRequest, request: Request) -> AuthResponse:
     if not auth_result:
         services.log_auth_event(
             event_type="login", success=False, username=username,
-            ip=str(ip) if ip else None, user_agent=ua, detail="invalid credentials",
+            ip=ip, user_agent=ua, detail="invalid credentials",
         )
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
-    user_id = auth_result["user_id"]
+    user_id = int(auth_result["user_id"])
     role = auth_result.get("role", "user")
-    token = create_access_token(subject=str(user_id), extra={"username": username, "role": role})
-    refresh_token = services.create_refresh_token(
-        user_id=int(user_id), ip=str(ip) if ip else None, user_agent=ua
-    )
+    refresh_token = services.create_refresh_token(user_id=user_id, ip=ip, user_agent=ua)
     services.log_auth_event(
         event_type="login", success=True, username=username,
-        user_id=int(user_id), ip=str(ip) if ip else None, user_agent=ua,
-    )
-    return AuthResponse(
-        access_token=token, refresh_token=refresh_token,
-        user_id=int(user_id), username=username, role=role,
+        user_id=user_id, ip=ip, user_agent=ua,
     )
+    return _issue_tokens(user_id=user_id, username=username, role=role, refresh_token=refresh_token)
 
 
 @router.post("/refresh", response_model=AuthResponse)
 def refresh(req: AuthRefreshRequest, request: Request) -> AuthResponse:
-    ip = getattr(getattr(request, "client", None), "host", None)
-    ua = request.headers.get("user-agent")
+    ip, ua = _client_meta(request)
 
     try:
-        if services.is_refresh_rate_limited(ip=str(ip) if ip else None):
+        if services.is_refresh_rate_limited(ip=ip):
             services.log_auth_event(
                 event_type="refresh_throttled", success=False,
-                ip=str(ip) if ip else None, user_agent=ua,
+                ip=ip, user_agent=ua,
             )
             raise HTTPException(status_code=429, detail="Too many refresh attempts. Please try again later.")
     except HTTPException:
@@ -93,27 +117,25 @@ def refresh(req: AuthRefreshRequest, request: Request) -> AuthResponse:
         logger.warning("Rate-limit check failed for refresh: %s", exc)
 
     rotated = services.rotate_refresh_token(
-        refresh_token=req.refresh_token, ip=str(ip) if ip else None, user_agent=ua
+        refresh_token=req.refresh_token, ip=ip, user_agent=ua
     )
     if not rotated:
         services.log_auth_event(
             event_type="refresh", success=False,
-            ip=str(ip) if ip else None, user_agent=ua, detail="invalid refresh token",
+            ip=ip, user_agent=ua, detail="invalid refresh token",
         )
         raise HTTPException(status_code=401, detail="Invalid refresh token")
 
     user_id, new_refresh_token = rotated
-    u = services.get_user(int(user_id))
+    u = services.get_user(user_id)
     username = str(getattr(u, "username", "") or "") if u is not None else ""
     role = str(getattr(u, "role", None) or "user") if u is not None else "user"
-    token = create_access_token(subject=str(user_id), extra={"username": username, "role": role})
     services.log_auth_event(
         event_type="refresh", success=True, username=username,
-        user_id=int(user_id), ip=str(ip) if ip else None, user_agent=ua,
+        user_id=user_id, ip=ip, user_agent=ua,
     )
-    return AuthResponse(
-        access_token=token, refresh_token=new_refresh_token,
-        user_id=int(user_id), username=username, role=role,
+    return _issue_tokens(
+        user_id=user_id, username=username, role=role, refresh_token=new_refresh_token
     )
 
 
@@ -138,17 +160,10 @@ def me(user=Depends(get_current_user)) -> AuthMeResponse:
 @router.post("/logout")
 def logout(req: AuthLogoutRequest | None = None, user=Depends(get_current_user)) -> Dict[str, str]:
     user_id = int(user["sub"])
-    jti = str(user.get("jti") or "").strip()
-    exp_raw = user.get("exp")
+    _revoke_access_token(user, user_id)
     try:
-        exp_dt = datetime.fromtimestamp(int(exp_raw), tz=timezone.utc)
-    except Exception:
-        exp_dt = datetime.now(timezone.utc)
-    if jti:
-        services.revoke_token(user_id=user_id, jti=jti, expires_at=exp_dt)
-    try:
-        if req is not None and getattr(req, "refresh_token", None):
-            services.revoke_refresh_token(user_id=user_id, refresh_token=str(req.refresh_token))
+        if req is not None and req.refresh_token:
+            services.revoke_refresh_token(user_id=user_id, refresh_token=req.refresh_token)
     except Exception as exc:
         logger.warning("Failed to revoke refresh token on logout for user %s: %s", user_id, exc)
     services.log_auth_event(
@@ -162,19 +177,12 @@ def logout(req: AuthLogoutRequest | None = None, user=Depends(get_current_user))
 def logout_all(user=Depends(get_current_user)) -> Dict[str, str]:
     user_id = int(user["sub"])
     token_iat = int(user.get("iat") or 0)
-    services.set_auth_valid_after_epoch(user_id=user_id, epoch_seconds=int(token_iat) + 1)
+    services.set_auth_valid_after_epoch(user_id=user_id, epoch_seconds=token_iat + 1)
     try:
         services.revoke_all_refresh_tokens(user_id=user_id)
     except Exception as exc:
         logger.warning("revoke_all_refresh_tokens failed on logout_all for user %s: %s", user_id, exc)
-    jti = str(user.get("jti") or "").strip()
-    exp_raw = user.get("exp")
-    try:
-        exp_dt = datetime.fromtimestamp(int(exp_raw), tz=timezone.utc)
-    except Exception:
-        exp_dt = datetime.now(timezone.utc)
-    if jti:
-        services.revoke_token(user_id=user_id, jti=jti, expires_at=exp_dt)
+    _revoke_access_token(user, user_id)
     services.log_auth_event(
         event_type="logout_all", success=True,
         username=str(user.get("username") or ""), user_id=user_id,
@@ -186,12 +194,13 @@ def logout_all(user=Depends(get_current_user)) -> Dict[str, str]:
 def change_password(req: AuthChangePasswordRequest, user=Depends(get_current_user)) -> AuthResponse:
     user_id = int(user["sub"])
     username = str(user.get("username") or "")
+    next_iat = int(user.get("iat") or 0) + 1
     try:
         services.change_password(
             user_id=user_id,
             old_password=req.current_password,
             new_password=req.new_password,
-            invalidate_tokens_before_epoch=int(user.get("iat") or 0) + 1,
+            invalidate_tokens_before_epoch=next_iat,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -200,17 +209,13 @@ def change_password(req: AuthChangePasswordRequest, user=Depends(get_current_use
     except Exception as exc:
         logger.warning("revoke_all_refresh_tokens failed on change_password for user %s: %s", user_id, exc)
     services.log_auth_event(
-        event_type="change_password", success=True,
-        username=str(user.get("username") or ""), user_id=user_id,
+        event_type="change_password", success=True, username=username, user_id=user_id,
     )
-    issued_at = datetime.fromtimestamp(int(user.get("iat") or 0) + 1, tz=timezone.utc)
-    token = create_access_token(
-        subject=str(user_id), extra={"username": username}, issued_at=issued_at
-    )
-    refresh_token = services.create_refresh_token(user_id=int(user_id))
-    return AuthResponse(
-        access_token=token, refresh_token=refresh_token,
-        user_id=int(user_id), username=username,
+    issued_at = datetime.fromtimestamp(next_iat, tz=timezone.utc)
+    refresh_token = services.create_refresh_token(user_id=user_id)
+    return _issue_tokens(
+        user_id=user_id, username=username, role=str(user.get("role") or "user"),
+        refresh_token=refresh_token, issued_at=issued_at,
     )
 
 
@@ -224,7 +229,7 @@ def auth_sessions(user=Depends(get_current_user)) -> List[AuthSessionOut]:
 def revoke_session(session_id: int, user=Depends(get_current_user)) -> Dict[str, str]:
     user_id = int(user["sub"])
     ok = services.revoke_refresh_session_by_id(
-        user_id=user_id, session_id=int(session_id), reason="revoked"
+        user_id=user_id, session_id=session_id, reason="revoked"
     )
     if not ok:
         raise HTTPException(status_code=404, detail="Session not found")
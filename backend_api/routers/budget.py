@@ -4,7 +4,6 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, List
 
-import pandas as pd
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from logic import services
@@ -22,7 +21,7 @@ from ..schemas import (
     CreditCardWeekRequest,
 )
 from ..deps import get_current_user
-from ..utils import df_records as _df_records
+from ..utils import dict_records as _dict_records
 
 logger = logging.getLogger("optionflow.budget")
 router = APIRouter(tags=["budget"])
@@ -212,4 +211,4 @@ def ledger_entries(
     offset: int = Query(default=0, ge=0),
 ) -> List[Dict[str, Any]]:
     rows = services.list_ledger_entries(user_id=int(user["sub"]), limit=int(limit), offset=int(offset))
-    return _df_records(pd.DataFrame(rows) if rows else pd.DataFrame())
+    return _dict_records(rows)
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+import threading
 import time
 from collections import defaultdict
 from datetime import datetime, timedelta as _td
@@ -9,8 +10,8 @@ from datetime import timezone as _tz
 from functools import partial
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, Query
 
@@ -50,6 +51,8 @@ async def search_tickers(q: str = "", limit: int = 8) -> List[Dict[str, Any]]:
         return cached[:limit]
 
     def _fetch() -> List[Dict[str, Any]]:
+        import yfinance as yf  # type: ignore[import-untyped]
+
         try:
             res = yf.Search(q, max_results=min(limit, 20), enable_fuzzy_query=True)
             quotes = res.quotes or []
@@ -90,7 +93,6 @@ async def search_tickers(q: str = "", limit: int = 8) -> List[Dict[str, Any]]:
 @router.post("/options/watch", status_code=204)
 def watch_symbols(body: Dict[str, Any], _user=Depends(get_current_user)) -> None:
     """Register symbols being watched by frontend (heartbeat to keep GEX poller alive)."""
-    import threading
     symbols: list[str] = [s.strip().upper() for s in body.get("symbols", []) if s]
     now = time.monotonic()
     new_symbols: list[str] = []
@@ -165,6 +167,8 @@ async def market_quotes(symbols: str) -> List[Dict[str, Any]]:
         raise HTTPException(status_code=400, detail="Provide 1–25 comma-separated symbols")
 
     def _fetch_quotes() -> List[Dict[str, Any]]:
+        import yfinance as yf  # type: ignore[import-untyped]
+
         results: List[Dict[str, Any]] = []
         for sym in syms:
             try:
@@ -258,6 +262,8 @@ async def stock_info(symbol: str, _user=Depends(get_current_user)) -> Dict[str,
             return None
 
     def _fetch_info() -> Dict[str, Any]:
+        import yfinance as yf  # type: ignore[import-untyped]
+
         try:
             ticker = yf.Ticker(sym)
             info = {}
@@ -345,6 +351,8 @@ async def get_live_quote(symbol: str, _user=Depends(get_current_user)) -> Dict[s
         return {"symbol": sym, "price": cached, "from_cache": True}
 
     def _fetch() -> Dict[str, Any]:
+        import yfinance as yf  # type: ignore[import-untyped]
+
         try:
             ticker = yf.Ticker(sym)
             fi = ticker.fast_info
@@ -368,6 +376,39 @@ async def get_live_quote(symbol: str, _user=Depends(get_current_user)) -> Dict[s
     return result
 
 
+def _history_bars(hist: pd.DataFrame, *, intraday: bool) -> List[Dict[str, Any]]:
+    """Turn a reset-index yfinance history frame into chart bars, column-wise.
+
+    Rows without a parseable timestamp or close are dropped; missing OHLV
+    values become ``None``.
+    """
+    dt_col = "Datetime" if "Datetime" in hist.columns else "Date" if "Date" in hist.columns else None
+    if dt_col is None or "Close" not in hist.columns:
+        return []
+    ts = pd.to_datetime(hist[dt_col], errors="coerce", utc=True)
+    close = pd.to_numeric(hist["Close"], errors="coerce")
+    keep = ts.notna() & close.notna()
+    hist, ts, close = hist[keep], ts[keep], close[keep]
+
+    def _col(name: str, *, as_int: bool = False) -> List[Any]:
+        if name not in hist.columns:
+            return [None] * len(hist)
+        col = pd.to_numeric(hist[name], errors="coerce").astype("float64")
+        if as_int:
+            col = np.trunc(col).astype("Int64")
+        return col.astype(object).where(col.notna(), None).tolist()
+
+    columns = {
+        "date":   ts.dt.strftime("%Y-%m-%dT%H:%M:%SZ" if intraday else "%Y-%m-%d").tolist(),
+        "open":   _col("Open"),
+        "high":   _col("High"),
+        "low":    _col("Low"),
+        "close":  close.astype(float).tolist(),
+        "volume": _col("Volume", as_int=True),
+    }
+    return [dict(zip(columns, vals)) for vals in zip(*columns.values())]
+
+
 @router.get("/stocks/{symbol}/history", response_model=Dict[str, Any])
 async def stock_history(
     symbol: str,
@@ -383,33 +424,14 @@ async def stock_history(
     intraday = iv not in {"1d", "5d", "1wk", "1mo", "3mo"}
 
     def _fetch() -> Dict[str, Any]:
+        import yfinance as yf  # type: ignore[import-untyped]
+
         try:
             ticker = yf.Ticker(sym)
             hist = ticker.history(period=p, interval=iv)
             if hist is None or hist.empty:
                 return {"symbol": sym, "bars": [], "current_price": None, "error": f"No data for {sym}"}
-            hist = hist.reset_index()
-            bars: List[Dict[str, Any]] = []
-            for _, row in hist.iterrows():
-                dt = row.get("Datetime") or row.get("Date")
-                close = row.get("Close")
-                if dt is None or close is None:
-                    continue
-                try:
-                    ts = pd.to_datetime(dt)
-                    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
-                    date_str = ts.strftime("%Y-%m-%dT%H:%M:%SZ") if intraday else ts.strftime("%Y-%m-%d")
-                    close_f  = float(close)
-                except Exception:
-                    continue
-                bars.append({
-                    "date":   date_str,
-                    "open":   float(row["Open"])   if "Open"   in row and pd.notna(row["Open"])   else None,
-                    "high":   float(row["High"])   if "High"   in row and pd.notna(row["High"])   else None,
-                    "low":    float(row["Low"])    if "Low"    in row and pd.notna(row["Low"])    else None,
-                    "close":  close_f,
-                    "volume": int(row["Volume"])   if "Volume" in row and pd.notna(row["Volume"]) else None,
-                })
+            bars = _history_bars(hist.reset_index(), intraday=intraday)
             return {"symbol": sym, "bars": bars, "current_price": bars[-1]["close"] if bars else None, "error": None}
         except Exception as exc:
             return {"symbol": sym, "bars": [], "current_price": None, "error": str(exc)}
@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from logic import services
 from ..schemas import (
@@ -39,15 +39,23 @@ def create_account(req: AccountCreateRequest, user=Depends(get_current_user)) ->
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     return AccountOut(
-        id=int(account_id), name=req.name,
+        id=account_id, name=req.name,
         broker=req.broker, currency=str(req.currency).upper(),
     )
 
 
 @router.get("/accounts/{account_id}/holdings", response_model=List[HoldingOut])
-def list_account_holdings(account_id: int, user=Depends(get_current_user)) -> List[HoldingOut]:
+def list_account_holdings(
+    account_id: int,
+    user=Depends(get_current_user),
+    limit: Optional[int] = Query(default=None, ge=1, le=2000),
+    offset: int = Query(default=0, ge=0),
+) -> List[HoldingOut]:
     try:
-        rows = services.list_holdings(user_id=int(user["sub"]), account_id=int(account_id))
+        rows = services.list_holdings(
+            user_id=int(user["sub"]), account_id=account_id,
+            limit=limit, offset=offset,
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     return [HoldingOut.model_validate(r) for r in rows]
@@ -60,7 +68,7 @@ def upsert_account_holding(
     try:
         r = services.upsert_holding(
             user_id=int(user["sub"]),
-            account_id=int(account_id),
+            account_id=account_id,
             symbol=req.symbol,
             quantity=float(req.quantity),
             avg_cost=req.avg_cost,
@@ -70,9 +78,24 @@ def upsert_account_holding(
     return HoldingOut.model_validate(r)
 
 
+@router.put("/accounts/{account_id}/holdings/bulk", response_model=List[HoldingOut])
+def bulk_upsert_account_holdings(
+    account_id: int, req: List[HoldingUpsertRequest], user=Depends(get_current_user)
+) -> List[HoldingOut]:
+    try:
+        rows = services.upsert_holdings(
+            user_id=int(user["sub"]),
+            account_id=account_id,
+            rows=[r.model_dump() for r in req],
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return [HoldingOut.model_validate(r) for r in rows]
+
+
 @router.delete("/holdings/{holding_id}")
 def delete_account_holding(holding_id: int, user=Depends(get_current_user)) -> Dict[str, str]:
-    ok = services.delete_holding(user_id=int(user["sub"]), holding_id=int(holding_id))
+    ok = services.delete_holding(user_id=int(user["sub"]), holding_id=holding_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Holding not found")
     return {"status": "ok"}
@@ -1,9 +1,19 @@
 import os
-import uuid
+import secrets
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
 import jwt
+from cachetools import TTLCache
+
+# Verified payloads keyed by (token, secret, audience, issuer). Every
+# authenticated request decodes its bearer token; the frontend reuses one
+# access token for its whole lifetime, so repeat requests skip the HMAC
+# check and JSON parse. Revocation is still checked per request in deps.
+_decoded_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+_decoded_cache_lock = threading.Lock()
 
 
 def _jwt_secret() -> str:
@@ -43,7 +53,7 @@ def create_access_token(
         "sub": subject,
         "iss": _jwt_issuer(),
         "aud": _jwt_audience(),
-        "jti": uuid.uuid4().hex,
+        "jti": secrets.token_hex(16),
         "iat": int(now.timestamp()),
         "exp": int((now + timedelta(minutes=minutes)).timestamp()),
     }
@@ -53,11 +63,20 @@ def create_access_token(
 
 
 def decode_token(token: str) -> Dict[str, Any]:
-    return jwt.decode(
+    secret, audience, issuer = _jwt_secret(), _jwt_audience(), _jwt_issuer()
+    key = (token, secret, audience, issuer)
+    with _decoded_cache_lock:
+        hit = _decoded_cache.get(key)
+    if hit is not None and hit["exp"] > time.time():
+        return dict(hit)
+    payload = jwt.decode(
         token,
-        _jwt_secret(),
+        secret,
         algorithms=["HS256"],
-        audience=_jwt_audience(),
-        issuer=_jwt_issuer(),
+        audience=audience,
+        issuer=issuer,
         options={"require": ["sub", "exp", "iat", "jti", "iss", "aud"]},
     )
+    with _decoded_cache_lock:
+        _decoded_cache[key] = payload
+    return dict(payload)
@@ -15,6 +15,8 @@ from datetime import timezone as _tz
 from pathlib import Path as _Path
 from typing import Any, Set
 
+from pandas import DatetimeIndex, Timestamp
+
 logger = logging.getLogger("optionflow.state")
 
 # ── GEX cache ─────────────────────────────────────────────────────────────────
@@ -86,9 +88,21 @@ def init_flow_db() -> None:
         _flow_db_initialised = True
 
 
+_flow_db_local = threading.local()
+
+
 def _flow_db() -> _sqlite3.Connection:
-    """Return a raw sqlite3 connection to the flow snapshot DB."""
-    return _sqlite3.connect(str(_FLOW_DB))
+    """Return this thread's sqlite3 connection to the flow snapshot DB.
+
+    Callers use it as ``with _flow_db() as con:`` (commit/rollback only, never
+    close), so one connection per worker thread is opened once and reused
+    instead of reconnecting on every poll and request.
+    """
+    con = getattr(_flow_db_local, "con", None)
+    if con is None:
+        con = _sqlite3.connect(str(_FLOW_DB))
+        _flow_db_local.con = con
+    return con
 
 
 def _record_flow_snapshot(
@@ -118,7 +132,6 @@ def _record_flow_snapshot(
 
 def backfill_history(sym: str, days: int) -> None:  # noqa: C901
     import yfinance as yf  # type: ignore[import-untyped]
-    from pandas import DatetimeIndex
 
     key = (sym, days)
     with _backfill_lock:
@@ -139,7 +152,11 @@ def backfill_history(sym: str, days: int) -> None:  # noqa: C901
         else:
             bars.index = idx.tz_convert("UTC")
         cutoff = datetime.now(_tz.utc) - _td(days=days)
-        bars = bars[bars.index >= cutoff]  # type: ignore[operator]
+        # Label-slice the sorted DatetimeIndex (binary search) rather than
+        # building a full boolean mask against the cutoff.
+        if not bars.index.is_monotonic_increasing:
+            bars = bars.sort_index()
+        bars = bars.loc[cutoff:]
         if bars.empty:
             return
         call_ratio, put_ratio, prem_per_share = 0.55, 0.45, 0.5
@@ -168,7 +185,6 @@ def backfill_history(sym: str, days: int) -> None:  # noqa: C901
             }
         rows_to_insert: list[tuple[str, str, float, float, float, float, float, int]] = []
         for ts_idx, row in bars.iterrows():
-            from pandas import Timestamp
             ts: Timestamp = ts_idx  # type: ignore[assignment]
             raw_ts = ts.isoformat(timespec="seconds")
             ts_str: str = raw_ts.replace(" ", "T")
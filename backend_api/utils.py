@@ -25,3 +25,16 @@ def df_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
                 cleaned[k] = v
         out.append(cleaned)
     return out
+
+
+def dict_records(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Serialise service-layer dict rows the same way as :func:`df_records`.
+
+    Top-level ``datetime`` values become ISO-8601 strings; everything else is
+    passed through untouched, so ``None`` stays ``None`` instead of being
+    coerced to ``NaN`` by a DataFrame round-trip.
+    """
+    return [
+        {k: (v.isoformat() if isinstance(v, datetime) else v) for k, v in rec.items()}
+        for rec in rows or ()
+    ]
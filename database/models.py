@@ -22,6 +22,7 @@ modes.
 from __future__ import annotations
 
 import os
+import threading
 from functools import lru_cache
 
 from sqlalchemy import (
@@ -191,6 +192,9 @@ class StockHolding(PortfolioBase):
     created_at          = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at          = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+# Not unique: logic/holdings keeps several lots per symbol (account_id NULL).
+Index("ix_stock_holdings_user_account_symbol", StockHolding.user_id, StockHolding.account_id, StockHolding.symbol)
+
 class HoldingEvent(PortfolioBase):
     __tablename__ = "holding_events"
     __table_args__ = {"schema": _schema("portfolio")}
@@ -324,6 +328,8 @@ class Budget(BudgetBase):
     created_at   = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at   = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+Index("ix_budget_user_type_date", Budget.user_id, Budget.type, Budget.date)
+
 class BudgetOverride(BudgetBase):
     __tablename__ = "budget_overrides"
     __table_args__ = {"schema": _schema("budget")}
@@ -362,6 +368,8 @@ class CashFlow(BudgetBase):
     date    = Column(DateTime, nullable=False)
     notes   = Column(String, nullable=True)
 
+Index("ix_cash_flow_user_date", CashFlow.user_id, CashFlow.date)
+
 class LedgerAccount(BudgetBase):
     __tablename__ = "ledger_accounts"
     __table_args__ = {"schema": _schema("budget")}
@@ -501,21 +509,43 @@ def get_engine() -> Engine:
 
 
 # ── Session factories ──────────────────────────────────────────────────────────
+# One sessionmaker per domain, built once alongside its engine, so each call
+# only constructs a Session instead of a fresh factory + Session.
+
+@lru_cache(maxsize=1)
+def _users_sessionmaker() -> sessionmaker:
+    return sessionmaker(bind=get_users_engine())
+
+@lru_cache(maxsize=1)
+def _trades_sessionmaker() -> sessionmaker:
+    return sessionmaker(bind=get_trades_engine())
+
+@lru_cache(maxsize=1)
+def _portfolio_sessionmaker() -> sessionmaker:
+    return sessionmaker(bind=get_portfolio_engine())
+
+@lru_cache(maxsize=1)
+def _budget_sessionmaker() -> sessionmaker:
+    return sessionmaker(bind=get_budget_engine())
+
+@lru_cache(maxsize=1)
+def _markets_sessionmaker() -> sessionmaker:
+    return sessionmaker(bind=get_markets_engine())
 
 def get_users_session():
-    return sessionmaker(bind=get_users_engine())()
+    return _users_sessionmaker()()
 
 def get_trades_session():
-    return sessionmaker(bind=get_trades_engine())()
+    return _trades_sessionmaker()()
 
 def get_portfolio_session():
-    return sessionmaker(bind=get_portfolio_engine())()
+    return _portfolio_sessionmaker()()
 
 def get_budget_session():
-    return sessionmaker(bind=get_budget_engine())()
+    return _budget_sessionmaker()()
 
 def get_markets_session():
-    return sessionmaker(bind=get_markets_engine())()
+    return _markets_sessionmaker()()
 
 def reset_engine_cache() -> None:
     get_users_engine.cache_clear()
@@ -523,18 +553,42 @@ def reset_engine_cache() -> None:
     get_portfolio_engine.cache_clear()
     get_budget_engine.cache_clear()
     get_markets_engine.cache_clear()
+    _users_sessionmaker.cache_clear()
+    _trades_sessionmaker.cache_clear()
+    _portfolio_sessionmaker.cache_clear()
+    _budget_sessionmaker.cache_clear()
+    _markets_sessionmaker.cache_clear()
+    global _db_initialised
+    with _db_init_lock:
+        _db_initialised = False
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # INIT
 # ═══════════════════════════════════════════════════════════════════════════════
 
+_db_initialised = False
+_db_init_lock = threading.Lock()
+
+
 def init_db():
     """Create all tables across all five domains. Safe to call multiple times.
 
     In Postgres mode, also creates the logical schemas (auth, trades, portfolio,
     budget, markets) if they don't already exist, then runs CREATE TABLE IF NOT
     EXISTS for every model — all on the shared engine.
+
+    Schema inspection only runs once per process (per engine set — see
+    reset_engine_cache); later calls are no-ops.
     """
+    global _db_initialised
+    with _db_init_lock:
+        if _db_initialised:
+            return
+        _init_db()
+        _db_initialised = True
+
+
+def _init_db() -> None:
     if _is_postgres():
         eng = get_users_engine()  # all engines point to the same URL
         from sqlalchemy import text
@@ -542,11 +596,19 @@ def init_db():
             for schema in ("auth", "trades", "portfolio", "budget", "markets"):
                 conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema}"'))
             conn.commit()
-        for base in (UsersBase, TradesBase, PortfolioBase, BudgetBase, MarketsBase):
-            base.metadata.create_all(eng)
+        pairs = [(base, eng) for base in (UsersBase, TradesBase, PortfolioBase, BudgetBase, MarketsBase)]
     else:
-        UsersBase.metadata.create_all(get_users_engine())
-        TradesBase.metadata.create_all(get_trades_engine())
-        PortfolioBase.metadata.create_all(get_portfolio_engine())
-        BudgetBase.metadata.create_all(get_budget_engine())
-        MarketsBase.metadata.create_all(get_markets_engine())
+        pairs = [
+            (UsersBase, get_users_engine()),
+            (TradesBase, get_trades_engine()),
+            (PortfolioBase, get_portfolio_engine()),
+            (BudgetBase, get_budget_engine()),
+            (MarketsBase, get_markets_engine()),
+        ]
+    for base, eng in pairs:
+        base.metadata.create_all(eng)
+        # create_all skips tables that already exist, so indexes added to a
+        # model later are never built on older databases — add them here.
+        for table in base.metadata.sorted_tables:
+            for idx in table.indexes:
+                idx.create(eng, checkfirst=True)
@@ -6,11 +6,21 @@ import hmac
 import logging
 import os
 import secrets
+import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
+from cachetools import TTLCache
+from sqlalchemy import insert, lambda_stmt, select
 from sqlalchemy.orm import sessionmaker
 
 from database.models import (
+    RefreshToken,
+    RevokedToken,
+    User,
     get_users_engine,
     get_users_session,
 )
@@ -24,18 +34,47 @@ except Exception as e:
         "passlib is required for secure password hashing. Install with: `pip install passlib[bcrypt]`"
     ) from e
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+def _build_pwd_context() -> CryptContext:
+    """Argon2id for new hashes; pbkdf2_sha256 kept so existing hashes still verify.
+
+    ``AUTH_HASH_PROFILE=test`` selects deliberately cheap Argon2 parameters so
+    the test suite isn't dominated by KDF time — never set it in production.
+    Falls back to pbkdf2-only when the argon2-cffi backend is not installed.
+    """
+    try:
+        import argon2  # noqa: F401  (backend for passlib's argon2 handler)
+    except Exception:
+        _logger.warning("argon2-cffi not installed; hashing new passwords with pbkdf2_sha256")
+        return CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+    if os.getenv("AUTH_HASH_PROFILE", "").strip().lower() == "test":
+        params = {"time_cost": 1, "memory_cost": 8 * 1024, "parallelism": 1, "salt_size": 8, "digest_size": 16}
+    else:
+        # OWASP baseline for Argon2id: 19 MiB, 2 iterations, 1 lane.
+        params = {"time_cost": 2, "memory_cost": 19 * 1024, "parallelism": 1}
+    return CryptContext(
+        schemes=["argon2", "pbkdf2_sha256"],
+        deprecated="auto",
+        **{f"argon2__{k}": v for k, v in params.items()},
+    )
+
+
+pwd_context = _build_pwd_context()
+
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> str:
+    """Hash of a random secret, verified against when there is no usable user
+    so unknown/inactive usernames cost the same KDF time as a wrong password."""
+    return pwd_context.hash(secrets.token_hex(16))
 
 # ── Compatibility: tests monkeypatch logic.services.engine ───────────────────
 # auth_services reads the monkeypatched value from logic.services at call-time.
 def _users_session():
     """Session for users.db (auth, tokens, events)."""
-    try:
-        import logic.services as _svc
-        if getattr(_svc, "engine", None) is not None:
-            return sessionmaker(bind=_svc.engine)()
-    except Exception:
-        pass
+    engine = getattr(sys.modules.get("logic.services"), "engine", None)
+    if engine is not None:
+        return sessionmaker(bind=engine)()
     import database.models as _dbm
     return _dbm.get_users_session()
 
@@ -48,6 +87,11 @@ def _normalize_str(x) -> str:
     return str(x).strip()
 
 
+# Policy / rate-limit settings are parsed from the environment once per
+# (name, default) and memoised; call _invalidate_config_cache() after changing
+# os.environ at runtime (the test suite does this around every test).
+
+@lru_cache(maxsize=None)
 def _policy_int(name: str, default: int) -> int:
     try:
         return int(os.getenv(name, str(default)))
@@ -55,6 +99,7 @@ def _policy_int(name: str, default: int) -> int:
         return int(default)
 
 
+@lru_cache(maxsize=None)
 def _policy_bool(name: str, default: bool) -> bool:
     raw = os.getenv(name)
     if raw is None:
@@ -62,6 +107,7 @@ def _policy_bool(name: str, default: bool) -> bool:
     return str(raw).strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
+@lru_cache(maxsize=None)
 def _rate_limit_int(name: str, default: int) -> int:
     try:
         return int(os.getenv(name, str(default)))
@@ -85,15 +131,20 @@ def _refresh_token_pepper() -> str:
     )
 
 
+@lru_cache(maxsize=4)
+def _refresh_token_hmac(pepper: str):
+    # Keyed HMAC state with the pepper already absorbed; copied per token.
+    return hmac.new(pepper.encode("utf-8"), digestmod=hashlib.sha256)
+
+
 def _hash_refresh_token(token: str) -> str:
     tok = str(token or "").strip()
-    return hmac.new(
-        _refresh_token_pepper().encode("utf-8"),
-        tok.encode("utf-8"),
-        hashlib.sha256,
-    ).hexdigest()
+    h = _refresh_token_hmac(_refresh_token_pepper()).copy()
+    h.update(tok.encode("utf-8"))
+    return h.hexdigest()
 
 
+@lru_cache(maxsize=1)
 def _refresh_token_ttl_days() -> int:
     try:
         return int(os.getenv("REFRESH_TOKEN_EXPIRES_DAYS", "30"))
@@ -101,6 +152,82 @@ def _refresh_token_ttl_days() -> int:
         return 30
 
 
+def _invalidate_config_cache() -> None:
+    """Forget memoised env settings so the next call re-reads os.environ."""
+    for fn in (_policy_int, _policy_bool, _rate_limit_int, _refresh_token_ttl_days):
+        fn.cache_clear()
+
+
+# ── Verified-login cache (opt-in) ─────────────────────────────────────────────
+# AUTH_VERIFY_CACHE=1 remembers successful (username, password) checks for a
+# short TTL so repeat logins skip the KDF. Only positive results are cached,
+# keyed by an HMAC of the password under a per-process random key (plaintext is
+# never retained), together with the password hash they were verified against.
+# The user row is still read on every login: a hit is honoured only while the
+# user is active and the stored hash is unchanged, and the role comes from the
+# row. That keeps changes made by other worker processes (deactivation,
+# deletion, password reset, role change) effective immediately; the local
+# invalidation calls just free the entry early.
+
+_VERIFY_CACHE_KEY = secrets.token_bytes(32)
+_verify_cache: TTLCache = TTLCache(maxsize=512, ttl=_policy_int("AUTH_VERIFY_CACHE_TTL_SECONDS", 60))
+_verify_cache_lock = threading.Lock()
+
+
+def _verify_cache_enabled() -> bool:
+    return _policy_bool("AUTH_VERIFY_CACHE", False)
+
+
+def _password_digest(password: str) -> bytes:
+    return hmac.new(_VERIFY_CACHE_KEY, str(password).encode("utf-8"), hashlib.sha256).digest()
+
+
+def _invalidate_verify_cache(username: str | None) -> None:
+    if username is None:
+        return
+    with _verify_cache_lock:
+        _verify_cache.pop(str(username).strip().lower(), None)
+
+
+# ── Login-failure sliding windows ─────────────────────────────────────────────
+# Per (username, ip) deque of failure timestamps (epoch seconds). A bucket is
+# hydrated from auth_events on first use, then kept current by log_auth_event,
+# so a rate-limit check is a prune + len() instead of a COUNT query. Buckets
+# expire after a short TTL and are re-read from the DB, which bounds memory and
+# picks up failures recorded by other worker processes.
+#
+# LOGIN_RATE_LIMIT_MAX_FAILURES / LOGIN_RATE_LIMIT_WINDOW_SECONDS are therefore
+# enforced per worker between refreshes: failures recorded by another process
+# are only counted once this worker's bucket expires (up to 30 s later). With
+# N workers an attacker can land up to roughly N × max failures in that gap,
+# so size the limit with the worker count in mind.
+
+_login_failures: TTLCache = TTLCache(maxsize=4096, ttl=30)
+_login_failures_lock = threading.Lock()
+
+
+def _record_login_failure(username: str | None, ip: str | None, created_at: datetime) -> None:
+    if username is None:
+        return
+    uname = str(username).strip()
+    ts = created_at.replace(tzinfo=timezone.utc).timestamp()
+    with _login_failures_lock:
+        for key in {(uname, (str(ip).strip() or None) if ip else None), (uname, None)}:
+            bucket = _login_failures.get(key)
+            # The event row is committed before this runs, so a bucket hydrated
+            # in between may already hold it; don't count it twice.
+            if bucket is not None and ts not in bucket:
+                bucket.append(ts)
+
+
+def _reset_auth_caches() -> None:
+    """Drop all in-process auth caches (tests swap the database underneath)."""
+    with _verify_cache_lock:
+        _verify_cache.clear()
+    with _login_failures_lock:
+        _login_failures.clear()
+
+
 # ── Password policy ───────────────────────────────────────────────────────────
 
 def _validate_password_policy(password: str) -> None:
@@ -114,13 +241,28 @@ def _validate_password_policy(password: str) -> None:
 
     if len(pw) < int(min_len):
         raise ValueError(f"password must be at least {int(min_len)} characters")
-    if req_upper and not any(c.isupper() for c in pw):
+
+    # Classify every character in one pass instead of one any() scan per rule.
+    has_upper = has_lower = has_digit = has_special = False
+    for c in pw:
+        if c.isupper():
+            has_upper = True
+        elif c.islower():
+            has_lower = True
+        elif c.isdigit():
+            has_digit = True
+        if not c.isalnum():
+            has_special = True
+        if has_upper and has_lower and has_digit and has_special:
+            break
+
+    if req_upper and not has_upper:
         raise ValueError("password must include an uppercase letter")
-    if req_lower and not any(c.islower() for c in pw):
+    if req_lower and not has_lower:
         raise ValueError("password must include a lowercase letter")
-    if req_digit and not any(c.isdigit() for c in pw):
+    if req_digit and not has_digit:
         raise ValueError("password must include a number")
-    if req_special and not any((not c.isalnum()) for c in pw):
+    if req_special and not has_special:
         raise ValueError("password must include a special character")
 
 
@@ -128,6 +270,7 @@ def _validate_password_policy(password: str) -> None:
 
 def create_user(username, password, role="user"):
     session = _users_session()
+    session.expire_on_commit = False  # user.id is read back after commit
     try:
         username = str(username).strip().lower()
         if not username:
@@ -153,20 +296,38 @@ def create_user(username, password, role="user"):
 
 
 def authenticate_user(username, password):
+    uname = str(username).strip().lower()
     session = _users_session()
     try:
         from database.models import User
-        uname = str(username).strip().lower()
         u = session.query(User).filter(User.username == uname).first()
-        if not u:
+        if not u or (hasattr(u, "is_active") and not u.is_active):
+            pwd_context.verify(password, _dummy_password_hash())
             return None
-        if hasattr(u, "is_active") and not u.is_active:
-            return None
-        ok = pwd_context.verify(password, u.password_hash)
+        result = {"user_id": u.id, "role": str(getattr(u, "role", None) or "user")}
+        digest = None
+        if _verify_cache_enabled():
+            digest = _password_digest(password)
+            with _verify_cache_lock:
+                hit = _verify_cache.get(uname)
+            if (
+                hit is not None
+                and hmac.compare_digest(hit[0], digest)
+                and hit[1] == u.password_hash
+            ):
+                return result
+        ok, new_hash = pwd_context.verify_and_update(password, u.password_hash)
         if not ok:
             return None
-        role = str(getattr(u, "role", None) or "user")
-        return {"user_id": u.id, "role": role}
+        if new_hash:
+            # Legacy pbkdf2 (or outdated argon2 params) — upgrade on successful login.
+            u.password_hash = new_hash
+            session.add(u)
+            session.commit()
+        if digest is not None:
+            with _verify_cache_lock:
+                _verify_cache[uname] = (digest, new_hash or u.password_hash)
+        return result
     finally:
         session.close()
 
@@ -210,6 +371,7 @@ def patch_user_admin(user_id: int, *, role: str | None = None, is_active: bool |
             u.role = str(role)
         if is_active is not None:
             u.is_active = bool(is_active)
+        _invalidate_verify_cache(u.username)
         session.add(u)
         session.commit()
     except Exception:
@@ -226,6 +388,7 @@ def delete_user_admin(user_id: int) -> None:
         u = session.query(User).filter(User.id == int(user_id)).first()
         if not u:
             raise ValueError("user not found")
+        _invalidate_verify_cache(u.username)
         session.delete(u)
         session.commit()
     except Exception:
@@ -249,6 +412,7 @@ def admin_set_password(user_id: int, new_password: str) -> None:
         _validate_password_policy(new_password)
         u.password_hash = pwd_context.hash(new_password)
         u.auth_valid_after = datetime.now(timezone.utc).replace(tzinfo=None)
+        _invalidate_verify_cache(u.username)
         session.add(u)
         session.commit()
     except Exception:
@@ -269,6 +433,7 @@ def update_username_admin(user_id: int, new_username: str) -> None:
         u = session.query(User).filter(User.id == int(user_id)).first()
         if not u:
             raise ValueError("user not found")
+        _invalidate_verify_cache(u.username)
         u.username = uname
         session.add(u)
         session.commit()
@@ -297,10 +462,17 @@ def set_auth_valid_after_epoch(*, user_id: int, epoch_seconds: int) -> None:
 
 
 def is_token_time_valid(*, user_id: int, token_iat: int) -> bool:
-    u = get_user(int(user_id))
-    if u is None:
+    uid = int(user_id)
+    session = _users_session()
+    try:
+        row = session.execute(
+            lambda_stmt(lambda: select(User.auth_valid_after).where(User.id == uid))
+        ).first()
+    finally:
+        session.close()
+    if row is None:
         return False
-    ava = getattr(u, "auth_valid_after", None)
+    ava = row[0]
     if not ava:
         return True
     try:
@@ -334,6 +506,7 @@ def change_password(
             u.auth_valid_after = _utc_naive_from_epoch_seconds(int(invalidate_tokens_before_epoch))
         else:
             u.auth_valid_after = datetime.now(timezone.utc).replace(tzinfo=None)
+        _invalidate_verify_cache(u.username)
         session.add(u)
         session.commit()
     except Exception:
@@ -373,11 +546,12 @@ def revoke_token(*, user_id: int, jti: str, expires_at: datetime) -> None:
 def is_token_revoked(*, jti: str) -> bool:
     session = _users_session()
     try:
-        from database.models import RevokedToken
         jti = str(jti).strip()
         if not jti:
             return False
-        hit = session.query(RevokedToken).filter(RevokedToken.jti == jti).first()
+        hit = session.execute(
+            lambda_stmt(lambda: select(RevokedToken.id).where(RevokedToken.jti == jti).limit(1))
+        ).first()
         return hit is not None
     finally:
         session.close()
@@ -391,12 +565,13 @@ def create_refresh_token(*, user_id: int, ip: str | None = None, user_agent: str
         from database.models import RefreshToken
         raw = f"rt_{secrets.token_urlsafe(32)}"
         now = datetime.now(timezone.utc).replace(tzinfo=None)
-        expires_at = (datetime.now(timezone.utc) + timedelta(days=_refresh_token_ttl_days())).replace(tzinfo=None)
+        expires_at = now + timedelta(days=_refresh_token_ttl_days())
         ua = (str(user_agent)[:500] if user_agent else None)
         ip_s = (str(ip).strip() if ip else None)
+        th = _hash_refresh_token(raw)
         rt = RefreshToken(
             user_id=int(user_id),
-            token_hash=_hash_refresh_token(raw),
+            token_hash=th,
             created_at=now,
             created_ip=ip_s,
             created_user_agent=ua,
@@ -419,19 +594,23 @@ def create_refresh_token(*, user_id: int, ip: str | None = None, user_agent: str
 
 
 def validate_refresh_token(*, refresh_token: str) -> int | None:
+    th = _hash_refresh_token(refresh_token)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
     session = _users_session()
     try:
-        from database.models import RefreshToken
-        th = _hash_refresh_token(refresh_token)
-        now = datetime.now(timezone.utc).replace(tzinfo=None)
-        rt = session.query(RefreshToken).filter(RefreshToken.token_hash == th).first()
+        rt = session.execute(
+            lambda_stmt(
+                lambda: select(RefreshToken.user_id, RefreshToken.expires_at, RefreshToken.revoked_at)
+                .where(RefreshToken.token_hash == th)
+            )
+        ).first()
         if not rt:
             return None
-        if getattr(rt, "revoked_at", None) is not None:
+        if rt.revoked_at is not None:
             return None
-        if getattr(rt, "expires_at", now) <= now:
+        if (rt.expires_at or now) <= now:
             return None
-        return int(getattr(rt, "user_id"))
+        return int(rt.user_id)
     finally:
         session.close()
 
@@ -457,18 +636,20 @@ def rotate_refresh_token(
 
         user_id = int(getattr(rt, "user_id"))
         new_raw = f"rt_{secrets.token_urlsafe(32)}"
+        new_th = _hash_refresh_token(new_raw)
+        new_expires_at = now + timedelta(days=_refresh_token_ttl_days())
         ua = (str(user_agent)[:500] if user_agent else None)
         ip_s = (str(ip).strip() if ip else None)
         new_rt = RefreshToken(
             user_id=user_id,
-            token_hash=_hash_refresh_token(new_raw),
+            token_hash=new_th,
             created_at=now,
             created_ip=ip_s,
             created_user_agent=ua,
             last_used_at=now,
             last_used_ip=ip_s,
             last_used_user_agent=ua,
-            expires_at=(datetime.now(timezone.utc) + timedelta(days=_refresh_token_ttl_days())).replace(tzinfo=None),
+            expires_at=new_expires_at,
             revoked_at=None,
             revoked_reason=None,
             replaced_by_token_id=None,
@@ -518,18 +699,15 @@ def revoke_all_refresh_tokens(*, user_id: int) -> int:
     try:
         from database.models import RefreshToken
         now = datetime.now(timezone.utc).replace(tzinfo=None)
-        tokens = (
+        n = (
             session.query(RefreshToken)
             .filter(RefreshToken.user_id == int(user_id))
             .filter(RefreshToken.revoked_at.is_(None))
-            .all()
+            .update(
+                {RefreshToken.revoked_at: now, RefreshToken.revoked_reason: "revoked_all"},
+                synchronize_session=False,
+            )
         )
-        n = 0
-        for rt in tokens:
-            rt.revoked_at = now
-            rt.revoked_reason = "revoked_all"
-            session.add(rt)
-            n += 1
         session.commit()
         return int(n)
     except Exception:
@@ -545,7 +723,16 @@ def list_refresh_sessions(*, user_id: int, limit: int = 25) -> list[dict]:
         from database.models import RefreshToken
         now = datetime.now(timezone.utc).replace(tzinfo=None)
         rows = (
-            session.query(RefreshToken)
+            session.query(
+                RefreshToken.id,
+                RefreshToken.created_at,
+                RefreshToken.last_used_at,
+                RefreshToken.last_used_ip,
+                RefreshToken.created_ip,
+                RefreshToken.last_used_user_agent,
+                RefreshToken.created_user_agent,
+                RefreshToken.expires_at,
+            )
             .filter(RefreshToken.user_id == int(user_id))
             .filter(RefreshToken.revoked_at.is_(None))
             .filter(RefreshToken.expires_at > now)
@@ -553,19 +740,17 @@ def list_refresh_sessions(*, user_id: int, limit: int = 25) -> list[dict]:
             .limit(int(limit))
             .all()
         )
-        out: list[dict] = []
-        for r in rows:
-            out.append(
-                {
-                    "id": int(getattr(r, "id")),
-                    "created_at": getattr(r, "created_at", None),
-                    "last_used_at": getattr(r, "last_used_at", None),
-                    "ip": str(getattr(r, "last_used_ip", "") or getattr(r, "created_ip", "") or "") or None,
-                    "user_agent": str(getattr(r, "last_used_user_agent", "") or getattr(r, "created_user_agent", "") or "") or None,
-                    "expires_at": getattr(r, "expires_at", None),
-                }
-            )
-        return out
+        return [
+            {
+                "id": rid,
+                "created_at": created_at,
+                "last_used_at": last_used_at,
+                "ip": last_ip or created_ip or None,
+                "user_agent": last_ua or created_ua or None,
+                "expires_at": expires_at,
+            }
+            for rid, created_at, last_used_at, last_ip, created_ip, last_ua, created_ua, expires_at in rows
+        ]
     finally:
         session.close()
 
@@ -612,18 +797,37 @@ def log_auth_event(
     session = _users_session()
     try:
         from database.models import AuthEvent
-        ev = AuthEvent(
-            created_at=datetime.now(timezone.utc).replace(tzinfo=None),
-            event_type=str(event_type),
-            success=bool(success),
-            username=(str(username).strip() if username is not None else None),
-            user_id=(int(user_id) if user_id is not None else None),
-            ip=(str(ip).strip() if ip is not None else None),
-            user_agent=(str(user_agent)[:500] if user_agent else None),
-            detail=(str(detail)[:500] if detail else None),
+        values = _auth_event_values(
+            event_type=event_type, success=success, username=username, user_id=user_id,
+            ip=ip, user_agent=user_agent, detail=detail,
         )
-        session.add(ev)
+        session.add(AuthEvent(**values))
+        session.commit()
+        if values["event_type"] == "login" and not values["success"]:
+            _record_login_failure(values["username"], values["ip"], values["created_at"])
+    except Exception:
+        session.rollback()
+        return
+    finally:
+        session.close()
+
+
+def log_auth_events(events: list[dict]) -> None:
+    """Append several auth audit events with one executemany INSERT (best-effort).
+
+    Each dict takes the same keyword arguments as ``log_auth_event``.
+    """
+    if not events:
+        return
+    session = _users_session()
+    try:
+        from database.models import AuthEvent
+        rows = [_auth_event_values(**ev) for ev in events]
+        session.execute(insert(AuthEvent), rows)
         session.commit()
+        for v in rows:
+            if v["event_type"] == "login" and not v["success"]:
+                _record_login_failure(v["username"], v["ip"], v["created_at"])
     except Exception:
         session.rollback()
         return
@@ -631,6 +835,28 @@ def log_auth_event(
         session.close()
 
 
+def _auth_event_values(
+    *,
+    event_type: str,
+    success: bool,
+    username: str | None = None,
+    user_id: int | None = None,
+    ip: str | None = None,
+    user_agent: str | None = None,
+    detail: str | None = None,
+) -> dict:
+    return {
+        "created_at": datetime.now(timezone.utc).replace(tzinfo=None),
+        "event_type": str(event_type),
+        "success": bool(success),
+        "username": (str(username).strip() if username is not None else None),
+        "user_id": (int(user_id) if user_id is not None else None),
+        "ip": (str(ip).strip() if ip is not None else None),
+        "user_agent": (str(user_agent)[:500] if user_agent else None),
+        "detail": (str(detail)[:500] if detail else None),
+    }
+
+
 def list_auth_events(*, user_id: int, limit: int = 25) -> list[dict]:
     session = _users_session()
     try:
@@ -663,21 +889,49 @@ def is_login_rate_limited(*, username: str, ip: str | None = None) -> bool:
     max_failures = _rate_limit_int("LOGIN_RATE_LIMIT_MAX_FAILURES", 10)
     if max_failures <= 0:
         return False
-    since = datetime.now(timezone.utc) - timedelta(seconds=int(window_s))
-    since_naive = since.replace(tzinfo=None)
+    uname = str(username).strip()
+    ip_s = (str(ip).strip() or None) if ip else None
+    cutoff = time.time() - int(window_s)
+    key = (uname, ip_s)
+    with _login_failures_lock:
+        bucket = _login_failures.get(key)
+        if bucket is not None:
+            return _count_recent(bucket, cutoff) >= int(max_failures)
+    # Query outside the lock so a cache miss doesn't stall every other login
+    # check and failure record; if another thread hydrated meanwhile, keep its
+    # bucket.
+    loaded = deque(_load_login_failures(uname, ip_s, cutoff))
+    with _login_failures_lock:
+        bucket = _login_failures.setdefault(key, loaded)
+        return _count_recent(bucket, cutoff) >= int(max_failures)
+
+
+def _count_recent(bucket: deque, cutoff: float) -> int:
+    """Drop timestamps older than ``cutoff`` and return what is left (lock held)."""
+    while bucket and bucket[0] < cutoff:
+        bucket.popleft()
+    return len(bucket)
+
+
+def _load_login_failures(username: str, ip: str | None, cutoff: float) -> list[float]:
+    """Epoch timestamps of failed logins since ``cutoff``, oldest first."""
+    since_naive = datetime.fromtimestamp(cutoff, tz=timezone.utc).replace(tzinfo=None)
     session = _users_session()
     try:
         from database.models import AuthEvent
         q = (
-            session.query(AuthEvent)
+            session.query(AuthEvent.created_at)
             .filter(AuthEvent.event_type == "login")
             .filter(AuthEvent.success.is_(False))
             .filter(AuthEvent.created_at >= since_naive)
-            .filter(AuthEvent.username == str(username).strip())
+            .filter(AuthEvent.username == username)
         )
         if ip:
-            q = q.filter(AuthEvent.ip == str(ip).strip())
-        return int(q.count()) >= int(max_failures)
+            q = q.filter(AuthEvent.ip == ip)
+        return [
+            created_at.replace(tzinfo=timezone.utc).timestamp()
+            for (created_at,) in q.order_by(AuthEvent.created_at).all()
+        ]
     finally:
         session.close()
 
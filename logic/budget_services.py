@@ -2,14 +2,17 @@
 from __future__ import annotations
 
 import logging
+import sys
 from datetime import datetime, timezone
 
 import pandas as pd
+from sqlalchemy import func, insert
 from sqlalchemy.orm import sessionmaker
 
 from database.models import (
     Budget,
     BudgetOverride,
+    BudgetType,
     CashAction,
     CashFlow,
     CreditCardWeek,
@@ -28,31 +31,32 @@ _logger = logging.getLogger("optionflow.budget")
 
 def _budget_session():
     """Session for budget.db. Respects monkeypatched logic.services.engine."""
-    try:
-        import logic.services as _svc
-        if getattr(_svc, "engine", None) is not None:
-            return sessionmaker(bind=_svc.engine)()
-    except Exception:
-        pass
+    engine = getattr(sys.modules.get("logic.services"), "engine", None)
+    if engine is not None:
+        return sessionmaker(bind=engine)()
     import database.models as _dbm
     return _dbm.get_budget_session()
 
 
 # ── Normalizers ───────────────────────────────────────────────────────────────
+# Exact enum values resolve with one dict lookup; anything else keeps the old
+# fallbacks (cash: any "D…" string is a deposit; budget: default EXPENSE).
+
+_CASH_ACTIONS = {m.value: m for m in CashAction}
+_BUDGET_TYPES = {m.value: m for m in BudgetType}
+
 
 def normalize_cash_action(action):
     s = str(action or "").strip().upper()
+    hit = _CASH_ACTIONS.get(s)
+    if hit is not None:
+        return hit
     return CashAction.DEPOSIT if s.startswith("D") else CashAction.WITHDRAW
 
 
 def normalize_budget_type(b_type):
-    from database.models import BudgetType
     s = str(b_type or "").strip().upper()
-    if s == "INCOME":
-        return BudgetType.INCOME
-    if s == "ASSET":
-        return BudgetType.ASSET
-    return BudgetType.EXPENSE
+    return _BUDGET_TYPES.get(s, BudgetType.EXPENSE)
 
 
 # ── Ledger private helpers ────────────────────────────────────────────────────
@@ -142,28 +146,25 @@ def _post_cash_ledger_entry(
     session.add(e)
     session.flush()
 
-    if et == LedgerEntryType.CASH_DEPOSIT:
-        lines = [
-            LedgerLine(entry_id=int(e.id), account_id=int(cash_acct.id), amount=+amt, memo=None),
-            LedgerLine(entry_id=int(e.id), account_id=int(equity_acct.id), amount=-amt, memo=None),
-        ]
-    else:
-        lines = [
-            LedgerLine(entry_id=int(e.id), account_id=int(equity_acct.id), amount=+amt, memo=None),
-            LedgerLine(entry_id=int(e.id), account_id=int(cash_acct.id), amount=-amt, memo=None),
-        ]
-    session.add_all(lines)
+    debit, credit = (cash_acct, equity_acct) if et == LedgerEntryType.CASH_DEPOSIT else (equity_acct, cash_acct)
+    # Both legs in one executemany; nothing reads the line objects back.
+    session.execute(insert(LedgerLine), [
+        {"entry_id": int(e.id), "account_id": int(debit.id), "amount": +amt, "memo": None},
+        {"entry_id": int(e.id), "account_id": int(credit.id), "amount": -amt, "memo": None},
+    ])
 
 
 # ── Cash ──────────────────────────────────────────────────────────────────────
 
 def save_cash(action, amount, date, notes, user_id=None) -> int:
     session = _budget_session()
+    session.expire_on_commit = False  # new_cash.id is read back after commit
     try:
         action_enum = normalize_cash_action(action)
+        cash_date = pd.to_datetime(date)
         new_cash = CashFlow(
             action=action_enum, amount=float(amount),
-            date=pd.to_datetime(date), notes=notes,
+            date=cash_date, notes=notes,
         )
         if user_id is not None:
             new_cash.user_id = int(user_id)
@@ -172,7 +173,7 @@ def save_cash(action, amount, date, notes, user_id=None) -> int:
 
         if user_id is not None:
             try:
-                eff = pd.to_datetime(date).to_pydatetime() if date is not None else None
+                eff = cash_date.to_pydatetime() if date is not None else None
             except Exception:
                 eff = None
             _post_cash_ledger_entry(
@@ -184,7 +185,6 @@ def save_cash(action, amount, date, notes, user_id=None) -> int:
             )
 
         session.commit()
-        session.refresh(new_cash)
         return int(new_cash.id)
     except Exception:
         session.rollback()
@@ -193,6 +193,53 @@ def save_cash(action, amount, date, notes, user_id=None) -> int:
         session.close()
 
 
+def save_cash_many(rows: list[dict], *, user_id: int) -> list[int]:
+    """Insert several cash flows for one user in a single transaction.
+
+    Each row is a dict with ``action``, ``amount``, ``date`` and optional
+    ``notes`` (same meaning as ``save_cash``). The CashFlow rows are flushed
+    together, then each gets its balanced ledger entry; one commit at the end.
+    Returns the new ids in input order.
+    """
+    if not rows:
+        return []
+    session = _budget_session()
+    session.expire_on_commit = False  # ids are read back after commit
+    try:
+        uid = int(user_id)
+        staged: list[tuple[CashFlow, object]] = []
+        for r in rows:
+            cash_date = pd.to_datetime(r.get("date"))
+            staged.append((
+                CashFlow(
+                    user_id=uid, action=normalize_cash_action(r.get("action")),
+                    amount=float(r["amount"]), date=cash_date, notes=r.get("notes"),
+                ),
+                cash_date,
+            ))
+        session.add_all([c for c, _ in staged])
+        session.flush()
+
+        for c, cash_date in staged:
+            notes = c.notes
+            _post_cash_ledger_entry(
+                session, user_id=uid, action=c.action,
+                amount=float(c.amount),
+                effective_at=(cash_date.to_pydatetime() if cash_date is not None else None),
+                notes=(str(notes) if notes is not None else None),
+                idempotency_key=f"cash_flow:{int(c.id)}",
+                source_type="cash_flow", source_id=int(c.id), currency="USD",
+            )
+
+        session.commit()
+        return [int(c.id) for c, _ in staged]
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
 def update_cash(cash_id: int, user_id: int, *, action: str | None = None, amount: float | None = None, date=None, notes: str | None = None) -> dict | None:
     session = _budget_session()
     try:
@@ -266,17 +313,16 @@ def get_cash_balance_ledger(*, user_id: int, currency: str = "USD") -> float:
     try:
         cur = str(currency or "USD").strip().upper() or "USD"
         cash_name = f"Cash ({cur})"
-        cash_acct = (
-            session.query(LedgerAccount)
+        # One round-trip: SUM the cash account's lines in SQL (0 if no account yet).
+        total = (
+            session.query(func.coalesce(func.sum(LedgerLine.amount), 0.0))
+            .join(LedgerAccount, LedgerAccount.id == LedgerLine.account_id)
             .filter(LedgerAccount.user_id == int(user_id))
             .filter(LedgerAccount.name == cash_name)
             .filter(LedgerAccount.currency == cur)
-            .first()
+            .scalar()
         )
-        if cash_acct is None:
-            return 0.0
-        rows = session.query(LedgerLine.amount).filter(LedgerLine.account_id == int(cash_acct.id)).all()
-        return float(sum(float(r[0] or 0.0) for r in rows))
+        return float(total or 0.0)
     finally:
         session.close()
 
@@ -376,28 +422,41 @@ def list_budget_entries(*, user_id: int, limit: int = 500, offset: int = 0) -> l
 def get_budget_summary(*, user_id: int) -> dict:
     session = _budget_session()
     try:
-        rows = session.query(Budget).filter(Budget.user_id == int(user_id)).all()
+        # Aggregate in SQL: one row per (category, type) instead of every entry.
+        groups = (
+            session.query(
+                Budget.category,
+                Budget.type,
+                func.sum(Budget.amount).label("amount"),
+                func.count(Budget.id).label("n"),
+            )
+            .filter(Budget.user_id == int(user_id))
+            .group_by(Budget.category, Budget.type)
+            .all()
+        )
         by_category: dict[str, float] = {}
         by_type: dict[str, float] = {}
         total_income = 0.0
         total_expense = 0.0
-        for r in rows:
-            cat = str(r.category or "Uncategorized")
-            b_type = str(getattr(getattr(r, "type", None), "value", r.type) or "EXPENSE").upper()
-            amt = float(r.amount or 0.0)
+        entry_count = 0
+        for g in groups:
+            cat = str(g.category or "Uncategorized")
+            b_type = str(getattr(g.type, "value", g.type) or "EXPENSE").upper()
+            amt = float(g.amount or 0.0)
             by_category[cat] = by_category.get(cat, 0.0) + amt
             by_type[b_type] = by_type.get(b_type, 0.0) + amt
             if b_type == "INCOME":
                 total_income += amt
             else:
                 total_expense += amt
+            entry_count += int(g.n)
         return {
             "total_income": total_income,
             "total_expense": total_expense,
             "net": total_income - total_expense,
             "by_category": by_category,
             "by_type": by_type,
-            "entry_count": len(rows),
+            "entry_count": entry_count,
         }
     finally:
         session.close()
@@ -584,14 +643,19 @@ def list_ledger_entries(*, user_id: int, limit: int = 100, offset: int = 0) -> l
             .order_by(LedgerEntry.created_at.desc())
             .offset(int(offset)).limit(int(limit)).all()
         )
-        out: list[dict] = []
-        for e in es:
-            lines = (
+        # One query for the lines of every entry on this page (was one per entry).
+        lines_by_entry: dict[int, list] = {int(e.id): [] for e in es}
+        if lines_by_entry:
+            for line, account in (
                 session.query(LedgerLine, LedgerAccount)
                 .join(LedgerAccount, LedgerAccount.id == LedgerLine.account_id)
-                .filter(LedgerLine.entry_id == int(e.id))
-                .all()
-            )
+                .filter(LedgerLine.entry_id.in_(list(lines_by_entry)))
+                .order_by(LedgerLine.id)
+            ):
+                lines_by_entry[int(line.entry_id)].append((line, account))
+        out: list[dict] = []
+        for e in es:
+            lines = lines_by_entry[int(e.id)]
             out.append({
                 "id": int(e.id),
                 "entry_type": str(getattr(getattr(e, "entry_type", None), "value", e.entry_type) or ""),
@@ -603,12 +667,12 @@ def list_ledger_entries(*, user_id: int, limit: int = 100, offset: int = 0) -> l
                 "source_id": (int(getattr(e, "source_id")) if getattr(e, "source_id", None) is not None else None),
                 "lines": [
                     {
-                        "account": str(getattr(a, "name", "") or ""),
-                        "account_type": str(getattr(getattr(a, "type", None), "value", a.type) or ""),
-                        "currency": str(getattr(a, "currency", "") or "USD"),
-                        "amount": float(getattr(l, "amount", 0.0) or 0.0),
+                        "account": str(getattr(account, "name", "") or ""),
+                        "account_type": str(getattr(getattr(account, "type", None), "value", account.type) or ""),
+                        "currency": str(getattr(account, "currency", "") or "USD"),
+                        "amount": float(getattr(line, "amount", 0.0) or 0.0),
                     }
-                    for (l, a) in lines
+                    for (line, account) in lines
                 ],
             })
         return out
@@ -21,9 +21,11 @@ from __future__ import annotations
 import math
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Optional
 import warnings
 
+import numpy as np
 import pandas as pd
 
 # ---------------------------------------------------------------------------
@@ -280,13 +282,27 @@ def _tradier_token() -> str | None:
     return tok if tok else None
 
 
+@lru_cache(maxsize=1)
+def _tradier_client():
+    """Shared keep-alive HTTP client for Tradier, created on first use.
+
+    Sized for the 16-way expiry fan-out in _fetch_chain_tradier so parallel
+    requests reuse pooled TLS connections instead of reconnecting each call.
+    """
+    import httpx
+
+    return httpx.Client(
+        timeout=10,
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+    )
+
+
 def _fetch_chain_tradier(symbol: str) -> tuple[float, pd.DataFrame]:
     """Fetch options chain from Tradier (real-time OPRA).
 
     Returns (spot_price, options_df) in the same shape as _fetch_chain_yfinance.
     Raises RuntimeError if Tradier is unavailable or token is missing.
     """
-    import urllib.request, urllib.error, json
     from concurrent.futures import ThreadPoolExecutor, as_completed
     from datetime import datetime as _dt
 
@@ -297,10 +313,12 @@ def _fetch_chain_tradier(symbol: str) -> tuple[float, pd.DataFrame]:
     base = "https://api.tradier.com/v1/markets"
     headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
 
+    client = _tradier_client()
+
     def _get(url: str) -> dict:
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            return json.loads(resp.read())
+        resp = client.get(url, headers=headers)
+        resp.raise_for_status()
+        return resp.json()
 
     # ── 1. Spot price ─────────────────────────────────────────────────────────
     quote_url = f"{base}/quotes?symbols={symbol.upper()}&greeks=false"
@@ -463,6 +481,24 @@ def _fetch_chain_yfinance(symbol: str) -> tuple[float, pd.DataFrame]:
     return spot, pd.DataFrame(all_rows)
 
 
+# Chain columns the GEX / flow aggregation actually reads; iv and T are only
+# needed while building rows (for the BS gamma fallback) and are dropped.
+_CHAIN_COLUMNS = ["strike", "expiry", "otype", "oi", "volume", "mid", "gamma"]
+
+
+def _compact_chain(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink the raw chain frame before aggregation: unused columns are dropped,
+    the repeated expiry/otype strings become categoricals (cheap equality masks
+    and groupbys) and the integer OI/volume columns are downcast. Float columns
+    stay float64 — GEX sums reach billions and float32 would visibly round them.
+    """
+    df = df[_CHAIN_COLUMNS].astype({"expiry": "category", "otype": "category"})
+    for col in ("oi", "volume"):
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
+
+
 def _compute_gex(df: pd.DataFrame, spot: float, lot_size: int = 100) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """
     Compute dealer GEX per row using the canonical Perfiliev/SpotGamma formula:
@@ -476,12 +512,12 @@ def _compute_gex(df: pd.DataFrame, spot: float, lot_size: int = 100) -> tuple[pd
     In practice: CallGEX positive, PutGEX negative — Net GEX > 0 = long gamma regime.
     """
     df = df.copy()
-    # Canonical formula: gamma × OI × lot_size × spot² × 0.01
-    df["gex_raw"] = df["gamma"] * df["oi"] * lot_size * spot * spot * 0.01
+    # Canonical formula: gamma × OI × lot_size × spot² × 0.01 — computed on the
+    # raw ndarrays so there is no per-row Python call or index alignment.
+    gex_raw = df["gamma"].to_numpy(dtype=float) * df["oi"].to_numpy(dtype=float) * (lot_size * spot * spot * 0.01)
+    df["gex_raw"] = gex_raw
     # Calls = positive, Puts = negative
-    df["gex"] = df.apply(
-        lambda r: r["gex_raw"] if r["otype"] == "call" else -r["gex_raw"], axis=1
-    )
+    df["gex"] = np.where(df["otype"].to_numpy() == "call", gex_raw, -gex_raw)
 
     # per-strike aggregate (all expiries combined)
     by_strike = (
@@ -571,6 +607,7 @@ def compute_gamma_exposure(symbol: str) -> GEXResult:
             result.error = f"No options data found for {sym}."
             return result
 
+        df = _compact_chain(df)
         expiries = sorted(df["expiry"].unique().tolist())
         result.expiries = expiries
 
@@ -632,7 +669,7 @@ def compute_gamma_exposure(symbol: str) -> GEXResult:
 
         # Top 10 strikes by total premium (near spot ±30%)
         df_near = df[(df["strike"] >= spot * 0.7) & (df["strike"] <= spot * 1.3)]
-        strike_flow = df_near.groupby(["strike", "otype"])["premium"].sum().unstack(fill_value=0)
+        strike_flow = df_near.groupby(["strike", "otype"], observed=True)["premium"].sum().unstack(fill_value=0)
         if "call" not in strike_flow.columns: strike_flow["call"] = 0.0
         if "put"  not in strike_flow.columns: strike_flow["put"]  = 0.0
         strike_flow["total"] = strike_flow["call"] + strike_flow["put"]
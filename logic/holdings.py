@@ -12,8 +12,11 @@ Covers:
 from __future__ import annotations
 
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
+from sqlalchemy import func
+
 from logic.services import get_session, _portfolio_session
 from database.models import (
     StockHolding,
@@ -53,28 +56,32 @@ def _holding_to_dict(h: StockHolding, session=None) -> dict:
     total_prem_sold       = 0.0
 
     if session is not None and h.id:
-        # Pull aggregated premium totals from ledger (no double-counting)
+        # Pull aggregated premium totals from ledger (no double-counting),
+        # plus the upside ceiling from active CC positions, in one pass.
         ledger_rows = (
-            session.query(PremiumLedger)
+            session.query(
+                PremiumLedger.realized_premium,
+                PremiumLedger.unrealized_premium,
+                PremiumLedger.premium_sold,
+                PremiumLedger.status,
+                PremiumLedger.option_type,
+                PremiumLedger.strike,
+            )
             .filter(PremiumLedger.holding_id == h.id)
             .all()
         )
-        realized_prem_total   = sum(r.realized_premium   for r in ledger_rows)
-        unrealized_prem_total = sum(r.unrealized_premium for r in ledger_rows)
-        total_prem_sold       = sum(r.premium_sold       for r in ledger_rows)
+        for realized, unrealized, sold, status, option_type, strike in ledger_rows:
+            realized_prem_total   += realized
+            unrealized_prem_total += unrealized
+            total_prem_sold       += sold
+            if status == "ACTIVE" and option_type == "CALL":
+                if upside_basis is None or strike < upside_basis:
+                    upside_basis = strike
 
         if h.shares > 0:
             unrealized_per_share = unrealized_prem_total / h.shares
             live_adj = max(0.0, adj - unrealized_per_share)
 
-        # Upside ceiling from active CC positions
-        active_cc_strikes = [
-            r.strike for r in ledger_rows
-            if r.status == "ACTIVE" and r.option_type == "CALL"
-        ]
-        if active_cc_strikes:
-            upside_basis = min(active_cc_strikes)
-
     basis_reduction_stored = round((h.cost_basis - adj)      * h.shares, 2)
     basis_reduction_live   = round((h.cost_basis - live_adj) * h.shares, 2)
 
@@ -187,13 +194,15 @@ def _recalculate_adj_basis(h: StockHolding, session) -> float:
     or closed — the adj_basis always reflects: new_cost - historical_savings.
     """
     # PremiumLedger path (primary — active holdings with linked positions)
-    ledger_rows = (
-        session.query(PremiumLedger)
+    ledger_count, realized_total = (
+        session.query(
+            func.count(PremiumLedger.id),
+            func.coalesce(func.sum(PremiumLedger.realized_premium), 0.0),
+        )
         .filter(PremiumLedger.holding_id == h.id)
-        .all()
+        .one()
     )
-    if ledger_rows:
-        realized_total = sum(r.realized_premium for r in ledger_rows)
+    if ledger_count:
         if h.shares > 0:
             adj = h.cost_basis - (realized_total / h.shares)
         else:
@@ -206,13 +215,15 @@ def _recalculate_adj_basis(h: StockHolding, session) -> float:
     #   CC_EXPIRED events  → negative delta (premium reductions)
     #   MANUAL close event → positive delta (stock-gain adjustment on close)
     # Together they give the true net adj_basis offset relative to cost_basis.
-    event_rows = (
-        session.query(HoldingEvent)
+    event_count, total_delta = (
+        session.query(
+            func.count(HoldingEvent.id),
+            func.coalesce(func.sum(HoldingEvent.basis_delta), 0.0),
+        )
         .filter(HoldingEvent.holding_id == h.id)
-        .all()
+        .one()
     )
-    if event_rows:
-        total_delta = sum(e.basis_delta for e in event_rows if e.basis_delta is not None)
+    if event_count:
         adj = h.cost_basis + total_delta
         return round(max(0.0, adj), 4)
 
@@ -875,6 +886,12 @@ def _parse_dt(val: Any) -> datetime | None:
     s = str(val).strip()
     if not s:
         return None
+    return _parse_dt_str(s)
+
+
+@lru_cache(maxsize=1024)
+def _parse_dt_str(s: str) -> datetime | None:
+    # Cached: callers pass the same few date strings over and over.
     for fmt in ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f"):
         try:
             return datetime.strptime(s[:19], fmt[:len(s[:19])])
@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any
 
 from logic.services import get_session, _portfolio_session
@@ -28,12 +29,11 @@ from database.models import (
 def _week_bounds(for_date: datetime | None = None):
     """Return (monday_00:00, friday_23:59:59) UTC for the week containing for_date.
     Accepts either a datetime or a date object."""
-    import datetime as _dt
     if for_date is None:
         d = datetime.now(timezone.utc).replace(
             hour=0, minute=0, second=0, microsecond=0, tzinfo=None
         )
-    elif isinstance(for_date, _dt.datetime):
+    elif isinstance(for_date, datetime):
         d = for_date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
     else:
         # date object — convert to datetime at midnight
@@ -416,6 +416,14 @@ def reopen_week(*, user_id: int, week_id: int) -> dict:
 
 # ── Option positions ──────────────────────────────────────────────────────────
 
+# Fields update_position copies from the request payload, with their coercion.
+_POSITION_DATE_FIELDS = frozenset({"sold_date", "buy_date", "expiry_date"})
+_POSITION_FLOAT_FIELDS = frozenset({"premium_in", "premium_out", "spot_price", "margin", "strike"})
+_POSITION_UPDATABLE = frozenset({
+    "contracts", "strike", "option_type", "sold_date", "buy_date",
+    "expiry_date", "premium_in", "premium_out", "spot_price", "is_roll", "margin", "notes",
+})
+
 def list_positions(*, user_id: int, week_id: int) -> list[dict]:
     session = _portfolio_session()
     try:
@@ -572,17 +580,11 @@ def update_position(*, user_id: int, position_id: int, data: dict) -> dict:
         if pos is None:
             raise ValueError("Position not found")
 
-        updatable = [
-            "contracts", "strike", "option_type", "sold_date", "buy_date",
-            "expiry_date", "premium_in", "premium_out", "spot_price", "is_roll", "margin", "notes",
-        ]
-        for field in updatable:
-            if field not in data:
-                continue
+        for field in _POSITION_UPDATABLE.intersection(data):
             val = data[field]
-            if field in ("sold_date", "buy_date", "expiry_date"):
+            if field in _POSITION_DATE_FIELDS:
                 val = parse_dt(val)
-            elif field in ("premium_in", "premium_out", "spot_price", "margin", "strike"):
+            elif field in _POSITION_FLOAT_FIELDS:
                 val = _float_or_none(val)
             elif field == "contracts":
                 val = int(val)
@@ -857,8 +859,7 @@ def portfolio_summary(*, user_id: int) -> dict:
 
         # Pad months from January up to (and including) the current month so the chart
         # shows a YTD skeleton without rendering future empty bars.
-        import datetime as _dt
-        _now = _dt.datetime.utcnow()
+        _now = datetime.utcnow()
         _cy  = _now.year
         _cm  = _now.month
         for _m in range(1, _cm + 1):
@@ -967,6 +968,13 @@ def parse_dt(val: Any) -> datetime | None:
     s = str(val).strip()
     if not s:
         return None
+    return _parse_dt_str(s)
+
+
+@lru_cache(maxsize=1024)
+def _parse_dt_str(s: str) -> datetime | None:
+    # Imports and list payloads repeat the same date strings; memoise the
+    # strptime format probing (datetimes are immutable, so sharing is safe).
     for fmt in ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f", "%m/%d/%Y"):
         try:
             return datetime.strptime(s[:19], fmt[:len(s[:19])])
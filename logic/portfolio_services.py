@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+import sys
 from datetime import datetime, timezone
 
 import pandas as pd
@@ -16,12 +17,9 @@ _logger = logging.getLogger("optionflow.portfolio")
 
 def _portfolio_session():
     """Session for portfolio.db. Respects monkeypatched logic.services.engine."""
-    try:
-        import logic.services as _svc
-        if getattr(_svc, "engine", None) is not None:
-            return sessionmaker(bind=_svc.engine)()
-    except Exception:
-        pass
+    engine = getattr(sys.modules.get("logic.services"), "engine", None)
+    if engine is not None:
+        return sessionmaker(bind=engine)()
     import database.models as _dbm
     return _dbm.get_portfolio_session()
 
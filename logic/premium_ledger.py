@@ -180,17 +180,23 @@ def sync_ledger_from_positions(*, user_id: int, holding_id: int | None = None) -
         positions = q.all()
 
         upserted = 0
-        rows = []
+        touched: list[PremiumLedger] = []
         now = datetime.utcnow()
 
+        # One query for every ledger row these positions could map to, instead
+        # of a SELECT per position; new rows are flushed together at the end.
+        existing_by_key: dict[tuple[int, int], PremiumLedger] = {}
+        if positions:
+            for r in session.query(PremiumLedger).filter(
+                PremiumLedger.position_id.in_([p.id for p in positions]),
+            ):
+                existing_by_key.setdefault((r.holding_id, r.position_id), r)
+
         for pos in positions:
             realized, unrealized, _close_loss = _compute_premiums(pos)
             prem_sold = (pos.premium_in or 0.0) * pos.contracts * 100
 
-            existing = session.query(PremiumLedger).filter(
-                PremiumLedger.holding_id  == pos.holding_id,
-                PremiumLedger.position_id == pos.id,
-            ).first()
+            existing = existing_by_key.get((pos.holding_id, pos.id))
 
             if existing:
                 existing.premium_sold       = prem_sold
@@ -198,7 +204,7 @@ def sync_ledger_from_positions(*, user_id: int, holding_id: int | None = None) -
                 existing.unrealized_premium = unrealized
                 existing.status             = pos.status.value
                 existing.updated_at         = now
-                rows.append(_row_to_dict(existing))
+                touched.append(existing)
             else:
                 row = PremiumLedger(
                     user_id             = user_id,
@@ -218,10 +224,11 @@ def sync_ledger_from_positions(*, user_id: int, holding_id: int | None = None) -
                     updated_at          = now,
                 )
                 session.add(row)
-                session.flush()
-                rows.append(_row_to_dict(row))
+                touched.append(row)
             upserted += 1
 
+        session.flush()
+        rows = [_row_to_dict(r) for r in touched]
         session.commit()
         return {"upserted": upserted, "rows": rows}
     finally:
@@ -12,7 +12,7 @@ IMPORTANT — monkeypatching compatibility:
   Tests use `monkeypatch.setattr(logic.services, "engine", fake_engine)`.
   The `engine = None` sentinel MUST remain here so that attribute exists on
   this module object. Each domain module reads it at call-time via
-  `import logic.services as _svc; getattr(_svc, "engine", None)`.
+  `getattr(sys.modules.get("logic.services"), "engine", None)`.
 """
 
 from database.models import (
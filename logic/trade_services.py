@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+import sys
 from datetime import datetime, timezone
 
 from sqlalchemy.orm import sessionmaker
@@ -20,24 +21,18 @@ _logger = logging.getLogger("optionflow.trades")
 
 def _get_trades_session():
     """Session for trades.db. Respects monkeypatched logic.services.engine."""
-    try:
-        import logic.services as _svc
-        if getattr(_svc, "engine", None) is not None:
-            return sessionmaker(bind=_svc.engine)()
-    except Exception:
-        pass
+    engine = getattr(sys.modules.get("logic.services"), "engine", None)
+    if engine is not None:
+        return sessionmaker(bind=engine)()
     import database.models as _dbm
     return _dbm.get_trades_session()
 
 
 def _get_portfolio_session():
     """Session for portfolio.db. Respects monkeypatched logic.services.engine."""
-    try:
-        import logic.services as _svc
-        if getattr(_svc, "engine", None) is not None:
-            return sessionmaker(bind=_svc.engine)()
-    except Exception:
-        pass
+    engine = getattr(sys.modules.get("logic.services"), "engine", None)
+    if engine is not None:
+        return sessionmaker(bind=engine)()
     import database.models as _dbm
     return _dbm.get_portfolio_session()
 
@@ -51,6 +46,7 @@ def get_session():
 
 def create_account(*, user_id: int, name: str, broker: str | None = None, currency: str = "USD") -> int:
     session = get_session()
+    session.expire_on_commit = False  # acct.id is read back after commit
     try:
         nm = str(name or "").strip()
         if not nm:
@@ -74,16 +70,20 @@ def create_account(*, user_id: int, name: str, broker: str | None = None, curren
 def list_accounts(*, user_id: int) -> list[dict]:
     session = get_session()
     try:
-        rows = session.query(Account).filter(Account.user_id == int(user_id)).order_by(Account.created_at.desc()).all()
+        rows = (
+            session.query(Account.id, Account.name, Account.broker, Account.currency, Account.created_at)
+            .filter(Account.user_id == int(user_id))
+            .order_by(Account.created_at.desc())
+        )
         return [
             {
-                "id": int(getattr(a, "id")),
-                "name": str(getattr(a, "name", "") or ""),
-                "broker": (str(getattr(a, "broker", "") or "") or None),
-                "currency": str(getattr(a, "currency", "") or "USD"),
-                "created_at": getattr(a, "created_at", None),
+                "id": aid,
+                "name": name or "",
+                "broker": broker or None,
+                "currency": currency or "USD",
+                "created_at": created_at,
             }
-            for a in rows
+            for aid, name, broker, currency, created_at in rows
         ]
     finally:
         session.close()
@@ -91,30 +91,43 @@ def list_accounts(*, user_id: int) -> list[dict]:
 
 # ── Account-linked holdings ───────────────────────────────────────────────────
 
-def list_holdings(*, user_id: int, account_id: int) -> list[dict]:
+_HOLDING_COLUMNS = (
+    StockHolding.id,
+    StockHolding.account_id,
+    StockHolding.symbol,
+    StockHolding.shares,
+    StockHolding.avg_cost,
+    StockHolding.updated_at,
+)
+
+
+def _holding_out(hid, account_id, symbol, shares, avg_cost, updated_at) -> dict:
+    return {
+        "id": int(hid),
+        "account_id": int(account_id),
+        "symbol": symbol or "",
+        "quantity": float(shares or 0.0),
+        "avg_cost": (float(avg_cost) if avg_cost is not None else None),
+        "updated_at": updated_at,
+    }
+
+
+def list_holdings(*, user_id: int, account_id: int, limit: int | None = None, offset: int = 0) -> list[dict]:
     trades_session = get_session()
     portfolio_session = _get_portfolio_session()
     try:
-        acct = trades_session.query(Account).filter(Account.id == int(account_id), Account.user_id == int(user_id)).first()
+        uid, aid = int(user_id), int(account_id)
+        acct = trades_session.query(Account).filter(Account.id == aid, Account.user_id == uid).first()
         if not acct:
             raise ValueError("account not found")
-        rows = (
-            portfolio_session.query(StockHolding)
-            .filter(StockHolding.user_id == int(user_id), StockHolding.account_id == int(account_id))
-            .order_by(StockHolding.symbol.asc())
-            .all()
+        q = (
+            portfolio_session.query(*_HOLDING_COLUMNS)
+            .filter(StockHolding.user_id == uid, StockHolding.account_id == aid)
+            .order_by(StockHolding.symbol.asc(), StockHolding.id.asc())
         )
-        return [
-            {
-                "id": int(getattr(h, "id")),
-                "account_id": int(getattr(h, "account_id")),
-                "symbol": str(getattr(h, "symbol", "") or ""),
-                "quantity": float(getattr(h, "shares", 0.0) or 0.0),
-                "avg_cost": (float(getattr(h, "avg_cost", 0.0)) if getattr(h, "avg_cost", None) is not None else None),
-                "updated_at": getattr(h, "updated_at", None),
-            }
-            for h in rows
-        ]
+        if limit is not None:
+            q = q.offset(int(offset)).limit(int(limit))
+        return [_holding_out(*row) for row in q]
     finally:
         trades_session.close()
         portfolio_session.close()
@@ -123,21 +136,23 @@ def list_holdings(*, user_id: int, account_id: int) -> list[dict]:
 def upsert_holding(*, user_id: int, account_id: int, symbol: str, quantity: float, avg_cost: float | None = None) -> dict:
     trades_session = get_session()
     portfolio_session = _get_portfolio_session()
+    portfolio_session.expire_on_commit = False  # the holding is serialised after commit
     try:
         sym = str(symbol or "").strip().upper()
         if not sym:
             raise ValueError("symbol is required")
-        acct = trades_session.query(Account).filter(Account.id == int(account_id), Account.user_id == int(user_id)).first()
+        uid, aid = int(user_id), int(account_id)
+        acct = trades_session.query(Account).filter(Account.id == aid, Account.user_id == uid).first()
         if not acct:
             raise ValueError("account not found")
 
-        h = portfolio_session.query(StockHolding).filter(StockHolding.user_id == int(user_id), StockHolding.account_id == int(account_id), StockHolding.symbol == sym).first()
+        h = portfolio_session.query(StockHolding).filter(StockHolding.user_id == uid, StockHolding.account_id == aid, StockHolding.symbol == sym).first()
         now = datetime.now(timezone.utc).replace(tzinfo=None)
         qty = float(quantity)
         cost = qty * (float(avg_cost) if avg_cost is not None else 0.0)
         if h is None:
             h = StockHolding(
-                user_id=int(user_id), account_id=int(account_id), symbol=sym,
+                user_id=uid, account_id=aid, symbol=sym,
                 shares=qty, cost_basis=cost, adjusted_cost_basis=cost,
                 avg_cost=(float(avg_cost) if avg_cost is not None else None), updated_at=now,
             )
@@ -150,14 +165,71 @@ def upsert_holding(*, user_id: int, account_id: int, symbol: str, quantity: floa
             h.updated_at = now
             portfolio_session.add(h)
         portfolio_session.commit()
-        return {
-            "id": int(getattr(h, "id")),
-            "account_id": int(getattr(h, "account_id")),
-            "symbol": str(getattr(h, "symbol", "") or ""),
-            "quantity": float(getattr(h, "shares", 0.0) or 0.0),
-            "avg_cost": (float(getattr(h, "avg_cost", 0.0)) if getattr(h, "avg_cost", None) is not None else None),
-            "updated_at": getattr(h, "updated_at", None),
-        }
+        return _holding_out(h.id, h.account_id, h.symbol, h.shares, h.avg_cost, h.updated_at)
+    except Exception:
+        portfolio_session.rollback()
+        raise
+    finally:
+        trades_session.close()
+        portfolio_session.close()
+
+
+def upsert_holdings(*, user_id: int, account_id: int, rows: list[dict]) -> list[dict]:
+    """Upsert several holdings into one account in a single transaction.
+
+    Each row is a dict with ``symbol``, ``quantity`` and optional ``avg_cost``
+    (same meaning as ``upsert_holding``). The account is checked once, existing
+    lots are fetched with one IN query, and everything commits together; a bad
+    row rolls the whole batch back. Returns one dict per input row, in order.
+    """
+    if not rows:
+        return []
+    trades_session = get_session()
+    portfolio_session = _get_portfolio_session()
+    try:
+        uid, aid = int(user_id), int(account_id)
+        cleaned: list[tuple[str, float, float | None]] = []
+        for r in rows:
+            sym = str(r.get("symbol") or "").strip().upper()
+            if not sym:
+                raise ValueError("symbol is required")
+            avg = r.get("avg_cost")
+            cleaned.append((sym, float(r["quantity"]), (float(avg) if avg is not None else None)))
+
+        acct = trades_session.query(Account).filter(Account.id == aid, Account.user_id == uid).first()
+        if not acct:
+            raise ValueError("account not found")
+
+        by_symbol: dict[str, StockHolding] = {}
+        for h in (
+            portfolio_session.query(StockHolding)
+            .filter(StockHolding.user_id == uid, StockHolding.account_id == aid)
+            .filter(StockHolding.symbol.in_({sym for sym, _, _ in cleaned}))
+            .order_by(StockHolding.id.desc())
+        ):
+            by_symbol[h.symbol] = h  # lowest id wins, matching upsert_holding's .first()
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        touched: list[StockHolding] = []
+        for sym, qty, avg in cleaned:
+            cost = qty * (avg if avg is not None else 0.0)
+            h = by_symbol.get(sym)
+            if h is None:
+                h = StockHolding(user_id=uid, account_id=aid, symbol=sym, updated_at=now)
+                portfolio_session.add(h)
+                by_symbol[sym] = h
+            h.shares = qty
+            h.cost_basis = cost
+            h.adjusted_cost_basis = cost
+            h.avg_cost = avg
+            h.updated_at = now
+            touched.append(h)
+        portfolio_session.flush()
+        # Serialise before commit so the default expire_on_commit doesn't
+        # force a reload SELECT per row.
+        out = [_holding_out(h.id, aid, h.symbol, h.shares, h.avg_cost, h.updated_at) for h in touched]
+        portfolio_session.commit()
+        return out
     except Exception:
         portfolio_session.rollback()
         raise
@@ -14,6 +14,8 @@ Options:
     --domain  Migrate only one domain: users|trades|portfolio|budget|markets
     --dry-run Print row counts without writing to Postgres
     --truncate Truncate target tables before inserting (idempotent re-runs)
+    --method  Bulk-load strategy: copy (COPY FROM STDIN, default) or multi
+              (multi-row INSERTs, for drivers/proxies without COPY support)
 
 Prerequisites:
     1. The target Postgres database must already exist.
@@ -33,6 +35,8 @@ Safety:
 from __future__ import annotations
 
 import argparse
+import csv
+import io
 import sys
 from pathlib import Path
 
@@ -83,6 +87,28 @@ DOMAIN_MAP: dict[str, tuple[str, list[str]]] = {
 }
 
 
+def _psql_insert_copy(table, conn, keys, data_iter) -> None:
+    """pandas ``to_sql`` method that streams rows through ``COPY ... FROM STDIN``.
+
+    One COPY per table instead of thousands of INSERT round-trips.  Uses the
+    psycopg 3 ``Cursor.copy`` API (``psycopg[binary]``) and falls back to
+    psycopg2's ``copy_expert`` with an in-memory CSV buffer.
+    """
+    dbapi_conn = conn.connection.dbapi_connection
+    target = f'"{table.schema}"."{table.name}"' if table.schema else f'"{table.name}"'
+    columns = ", ".join(f'"{k}"' for k in keys)
+    with dbapi_conn.cursor() as cur:
+        if hasattr(cur, "copy"):
+            with cur.copy(f"COPY {target} ({columns}) FROM STDIN") as copy:
+                for row in data_iter:
+                    copy.write_row(row)
+            return
+        buf = io.StringIO()
+        csv.writer(buf).writerows(data_iter)
+        buf.seek(0)
+        cur.copy_expert(f"COPY {target} ({columns}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
 def migrate_domain(
     domain: str,
     db_dir: Path,
@@ -90,6 +116,7 @@ def migrate_domain(
     *,
     dry_run: bool,
     truncate: bool,
+    method: str = "copy",
 ) -> None:
     schema, tables = DOMAIN_MAP[domain]
     sqlite_path = db_dir / f"{domain}.db"
@@ -132,8 +159,8 @@ def migrate_domain(
                 schema=schema,
                 if_exists="append",
                 index=False,
-                method="multi",
-                chunksize=500,
+                method=_psql_insert_copy if method == "copy" else "multi",
+                chunksize=None if method == "copy" else 1000,
             )
 
 
@@ -167,6 +194,12 @@ def main() -> None:
         action="store_true",
         help="Truncate target tables before inserting (idempotent re-runs)",
     )
+    parser.add_argument(
+        "--method",
+        choices=["copy", "multi"],
+        default="copy",
+        help="Bulk-load strategy: COPY FROM STDIN (default) or multi-row INSERTs",
+    )
     args = parser.parse_args()
 
     repo_root = Path(__file__).resolve().parent.parent
@@ -187,7 +220,8 @@ def main() -> None:
     domains = [args.domain] if args.domain else list(DOMAIN_MAP.keys())
     for domain in domains:
         print(f"[{domain}]")
-        migrate_domain(domain, db_dir, pg_eng, dry_run=args.dry_run, truncate=args.truncate)
+        migrate_domain(domain, db_dir, pg_eng, dry_run=args.dry_run, truncate=args.truncate,
+                       method=args.method)
         print()
 
     print("Done." if not args.dry_run else "Dry-run complete — re-run without --dry-run to write data.")
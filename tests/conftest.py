@@ -1,36 +1,110 @@
+import os
+
 import pytest
-from sqlalchemy import create_engine, StaticPool
+from sqlalchemy import create_engine, event, StaticPool
 from sqlalchemy.orm import sessionmaker
 
-import database.models as dbmodels
-import logic.services as services
+# Cheap Argon2 parameters for the suite. Must be set before logic.auth_services
+# is imported, since its CryptContext is built at import time.
+os.environ.setdefault("AUTH_HASH_PROFILE", "test")
+
+import database.models as dbmodels  # noqa: E402
+import logic.auth_services as auth_services  # noqa: E402
+import logic.services as services  # noqa: E402
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _memoized_password_hashes():
+    """Hash each distinct test password once per session.
+
+    Nearly every test creates users with the same handful of passwords; reusing
+    the first hash (random salt and all) keeps the KDF out of the per-test cost.
+    verify() is untouched, so wrong-password paths still exercise the hasher.
+    """
+    cache: dict[str, str] = {}
+    real_hash = auth_services.pwd_context.hash
+
+    def _hash(secret, **kwargs):
+        if kwargs:
+            return real_hash(secret, **kwargs)
+        if secret not in cache:
+            cache[secret] = real_hash(secret)
+        return cache[secret]
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(auth_services.pwd_context, 'hash', _hash)
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _fresh_auth_config():
+    """Re-read env-driven auth settings around each test.
+
+    auth_services memoises its policy/rate-limit env lookups; tests that
+    monkeypatch.setenv those values need the cache dropped before they run
+    and again after monkeypatch has restored the environment.
+    """
+    auth_services._invalidate_config_cache()
+    yield
+    auth_services._invalidate_config_cache()
+
+
+_BASES = (
+    dbmodels.UsersBase,
+    dbmodels.TradesBase,
+    dbmodels.PortfolioBase,
+    dbmodels.BudgetBase,
+    dbmodels.MarketsBase,
+)
+
+
+@pytest.fixture(scope='session')
+def _test_engine():
+    """One in-memory SQLite engine with every domain's schema, built once per run.
+
+    Under pytest-xdist each worker is its own process, so each gets a private
+    :memory: database (and private auth caches) with no extra wiring.
+    """
+    engine = create_engine(
+        'sqlite:///:memory:',
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # Test data is throwaway: skip rollback-journal bookkeeping and syncs.
+    @event.listens_for(engine, "connect")
+    def _fast_sqlite_pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=MEMORY")
+        cur.execute("PRAGMA synchronous=OFF")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.close()
+
+    # Create tables for every domain on the single shared engine
+    for base in _BASES:
+        base.metadata.create_all(engine)
+
+    yield engine
+    engine.dispose()
 
 
 @pytest.fixture(scope='function')
-def db_engine_and_session(monkeypatch):
+def db_engine_and_session(monkeypatch, _test_engine):
     """Provide a single shared in-memory SQLite engine for all domains.
 
     Using one engine with StaticPool means every session call shares the same
     connection and in-memory database, so cross-domain queries (e.g. Account on
     trades.db + StockHolding on portfolio.db) work correctly in tests.
 
+    The schema is created once per run; after each test every table is
+    emptied (plain DELETEs, children first) instead of rebuilding the DDL.
+
     We patch both database.models and logic.services so every session factory
     and engine getter — however imported — returns our test engine/session.
     """
-    engine = create_engine(
-        'sqlite:///:memory:',
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
+    engine = _test_engine
     Session = sessionmaker(bind=engine)
 
-    # Create tables for every domain on the single shared engine
-    dbmodels.UsersBase.metadata.create_all(engine)
-    dbmodels.TradesBase.metadata.create_all(engine)
-    dbmodels.PortfolioBase.metadata.create_all(engine)
-    dbmodels.BudgetBase.metadata.create_all(engine)
-    dbmodels.MarketsBase.metadata.create_all(engine)
-
     # Session factory that always returns a session on the shared engine
     def _sess():
         return Session()
@@ -65,4 +139,13 @@ def db_engine_and_session(monkeypatch):
     #    helpers fall through to the patched get_*_session functions above.
     monkeypatch.setattr(services, 'engine', None)
 
+    # 5. Each test gets a fresh database, so in-process auth caches must not
+    #    carry users/tokens over from the previous one.
+    auth_services._reset_auth_caches()
+
     yield engine, Session
+
+    with engine.begin() as conn:
+        for base in _BASES:
+            for table in reversed(base.metadata.sorted_tables):
+                conn.execute(table.delete())
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from logic import services
 
 
@@ -9,6 +11,8 @@ def test_create_and_auth(db_engine_and_session):
     assert auth_result['user_id'] == uid
     # wrong password
     assert services.authenticate_user('alice', 'wrong') is None
+    # unknown user (verified against the dummy hash)
+    assert services.authenticate_user('nobody', 'GoodPassword12') is None
 
 
 def test_per_user_isolation(db_engine_and_session):
@@ -22,13 +26,13 @@ def test_per_user_isolation(db_engine_and_session):
     services.create_account(user_id=b_id, name='User_B_Account')
 
     # verify per-user isolation
-    accounts_a = services.list_accounts(user_id=a_id)
-    accounts_b = services.list_accounts(user_id=b_id)
+    names_a = {ac['name'] for ac in services.list_accounts(user_id=a_id)}
+    names_b = {ac['name'] for ac in services.list_accounts(user_id=b_id)}
 
-    assert any(ac['name'] == 'User_A_Account' for ac in accounts_a)
-    assert not any(ac['name'] == 'User_B_Account' for ac in accounts_a)
-    assert any(ac['name'] == 'User_B_Account' for ac in accounts_b)
-    assert not any(ac['name'] == 'User_A_Account' for ac in accounts_b)
+    assert 'User_A_Account' in names_a
+    assert 'User_B_Account' not in names_a
+    assert 'User_B_Account' in names_b
+    assert 'User_A_Account' not in names_b
 
 
 def test_change_password(db_engine_and_session):
@@ -39,6 +43,71 @@ def test_change_password(db_engine_and_session):
     assert services.authenticate_user('bob', 'BetterPassword34')['user_id'] == uid
 
 
+def test_legacy_pbkdf2_hash_upgraded_on_login(db_engine_and_session):
+    from passlib.hash import pbkdf2_sha256
+    from database.models import User
+
+    _, Session = db_engine_and_session
+    uid = services.create_user('legacy', 'GoodPassword12')
+    s = Session()
+    u = s.query(User).filter(User.id == uid).one()
+    u.password_hash = pbkdf2_sha256.hash('GoodPassword12')
+    s.commit()
+    s.close()
+
+    assert services.authenticate_user('legacy', 'GoodPassword12')['user_id'] == uid
+    upgraded = services.get_user(uid).password_hash
+    assert upgraded.startswith('$argon2id$')
+    assert services.authenticate_user('legacy', 'GoodPassword12')['user_id'] == uid
+
+
+def test_verify_cache_invalidated_on_password_and_status_change(db_engine_and_session, monkeypatch):
+    from logic import auth_services
+
+    monkeypatch.setenv("AUTH_VERIFY_CACHE", "1")
+    uid = services.create_user('cached', 'GoodPassword12')
+    assert services.authenticate_user('cached', 'GoodPassword12')['user_id'] == uid
+    assert 'cached' in auth_services._verify_cache
+    assert services.authenticate_user('cached', 'WrongPassword12') is None
+
+    services.change_password(user_id=uid, old_password='GoodPassword12', new_password='BetterPassword34')
+    assert services.authenticate_user('cached', 'GoodPassword12') is None
+    assert services.authenticate_user('cached', 'BetterPassword34')['user_id'] == uid
+
+    services.patch_user_admin(uid, is_active=False)
+    assert services.authenticate_user('cached', 'BetterPassword34') is None
+
+
+def test_verify_cache_rechecks_user_row_changed_elsewhere(db_engine_and_session, monkeypatch):
+    from database.models import User
+    from logic import auth_services
+
+    monkeypatch.setenv("AUTH_VERIFY_CACHE", "1")
+    uid = services.create_user('elsewhere', 'GoodPassword12', role='admin')
+    assert services.authenticate_user('elsewhere', 'GoodPassword12')['role'] == 'admin'
+
+    def _update(**values):
+        # Write the row directly, as another worker would, without touching
+        # this process's verify cache.
+        session = auth_services._users_session()
+        try:
+            session.query(User).filter(User.id == uid).update(values)
+            session.commit()
+        finally:
+            session.close()
+
+    _update(role='user')
+    assert services.authenticate_user('elsewhere', 'GoodPassword12')['role'] == 'user'
+
+    _update(password_hash=auth_services.pwd_context.hash('OtherPassword34'))
+    assert services.authenticate_user('elsewhere', 'GoodPassword12') is None
+
+    _update(password_hash=auth_services.pwd_context.hash('GoodPassword12'))
+    assert services.authenticate_user('elsewhere', 'GoodPassword12') is not None
+    _update(is_active=False)
+    assert services.authenticate_user('elsewhere', 'GoodPassword12') is None
+
+
 def test_idempotent_trade_submission(db_engine_and_session):
     uid = services.create_user('carol', 'GoodPassword12')
     # Create an account and verify only one exists
@@ -54,6 +123,15 @@ def test_auth_valid_after_cutoff(db_engine_and_session):
     assert services.is_token_time_valid(user_id=uid, token_iat=99) is False
     assert services.is_token_time_valid(user_id=uid, token_iat=100) is True
     assert services.is_token_time_valid(user_id=uid, token_iat=101) is True
+    assert services.is_token_time_valid(user_id=uid + 1000, token_iat=101) is False
+
+
+def test_is_token_revoked_binds_jti_per_call(db_engine_and_session):
+    uid = services.create_user('hank', 'GoodPassword12')
+    services.revoke_token(user_id=uid, jti='jti-a', expires_at=datetime(2099, 1, 1))
+    assert services.is_token_revoked(jti='jti-a') is True
+    assert services.is_token_revoked(jti='jti-b') is False
+    assert services.is_token_revoked(jti='') is False
 
 
 def test_refresh_token_rotation_and_revoke_all(db_engine_and_session):
@@ -83,12 +161,37 @@ def test_login_rate_limit_counts_failures(db_engine_and_session, monkeypatch):
     ip = "1.2.3.4"
     assert services.is_login_rate_limited(username=username, ip=ip) is False
 
-    services.log_auth_event(event_type="login", success=False, username=username, ip=ip)
-    services.log_auth_event(event_type="login", success=False, username=username, ip=ip)
+    services.log_auth_events([
+        {"event_type": "login", "success": False, "username": username, "ip": ip},
+        {"event_type": "login", "success": False, "username": username, "ip": ip},
+    ])
     assert services.is_login_rate_limited(username=username, ip=ip) is False
 
     services.log_auth_event(event_type="login", success=False, username=username, ip=ip)
     assert services.is_login_rate_limited(username=username, ip=ip) is True
+    # Buckets not seen before are hydrated from auth_events.
+    assert services.is_login_rate_limited(username=username) is True
+    assert services.is_login_rate_limited(username=username, ip="5.6.7.8") is False
+
+
+def test_login_rate_limit_does_not_double_count_hydrated_failure(db_engine_and_session, monkeypatch):
+    import logic.auth_services as auth_services
+
+    monkeypatch.setenv("LOGIN_RATE_LIMIT_MAX_FAILURES", "3")
+    username, ip = "grace", "1.2.3.4"
+    services.log_auth_events([
+        {"event_type": "login", "success": False, "username": username, "ip": ip},
+        {"event_type": "login", "success": False, "username": username, "ip": ip},
+    ])
+    # The bucket is hydrated after the second row committed but before its
+    # in-process record lands; replaying that record must not count it again.
+    auth_services._reset_auth_caches()
+    assert services.is_login_rate_limited(username=username, ip=ip) is False
+    last = auth_services._load_login_failures(username, ip, 0)[-1]
+    auth_services._record_login_failure(
+        username, ip, datetime.utcfromtimestamp(last),
+    )
+    assert services.is_login_rate_limited(username=username, ip=ip) is False
 
 
 def test_list_and_revoke_refresh_sessions(db_engine_and_session):
@@ -122,6 +225,25 @@ def test_password_policy_enforced_on_signup(db_engine_and_session):
     assert isinstance(uid, int)
 
 
+def test_password_policy_reports_first_missing_class(db_engine_and_session, monkeypatch):
+    from logic import auth_services
+
+    monkeypatch.setenv("PASSWORD_REQUIRE_SPECIAL", "1")
+    cases = {
+        "alllowercase12!": "uppercase",
+        "ALLUPPERCASE12!": "lowercase",
+        "NoDigitsHere!!": "number",
+        "NoSpecialChar12": "special",
+    }
+    for pw, expected in cases.items():
+        try:
+            auth_services._validate_password_policy(pw)
+            assert False, f"expected ValueError for {pw!r}"
+        except ValueError as e:
+            assert expected in str(e)
+    auth_services._validate_password_policy("Good-Password12")
+
+
 def test_password_policy_enforced_on_change_password(db_engine_and_session):
     uid = services.create_user("policy3", "GoodPassword12")
 
@@ -163,3 +285,39 @@ def test_accounts_and_holdings_isolation_and_upsert(db_engine_and_session):
         assert False, "expected ValueError"
     except ValueError:
         pass
+
+
+def test_list_holdings_pages_by_symbol(db_engine_and_session):
+    uid = services.create_user("acct_page", "GoodPassword12")
+    acct = services.create_account(user_id=uid, name="Main")
+    for sym in ("MSFT", "AAPL", "NVDA", "AMZN"):
+        services.upsert_holding(user_id=uid, account_id=acct, symbol=sym, quantity=1)
+
+    assert [r["symbol"] for r in services.list_holdings(user_id=uid, account_id=acct)] == ["AAPL", "AMZN", "MSFT", "NVDA"]
+    page1 = services.list_holdings(user_id=uid, account_id=acct, limit=2)
+    page2 = services.list_holdings(user_id=uid, account_id=acct, limit=2, offset=2)
+    assert [r["symbol"] for r in page1 + page2] == ["AAPL", "AMZN", "MSFT", "NVDA"]
+
+
+def test_upsert_holdings_bulk_matches_single_upserts(db_engine_and_session):
+    uid = services.create_user("acct_bulk", "GoodPassword12")
+    other = services.create_user("acct_bulk_b", "GoodPassword12")
+    acct = services.create_account(user_id=uid, name="Main")
+    existing = services.upsert_holding(user_id=uid, account_id=acct, symbol="AAPL", quantity=1, avg_cost=90.0)
+
+    out = services.upsert_holdings(user_id=uid, account_id=acct, rows=[
+        {"symbol": "aapl", "quantity": 5, "avg_cost": 100.0},
+        {"symbol": "MSFT", "quantity": 2},
+    ])
+    assert [r["symbol"] for r in out] == ["AAPL", "MSFT"]
+    assert out[0]["id"] == existing["id"] and out[0]["quantity"] == 5.0
+    assert out[1]["avg_cost"] is None
+
+    rows = services.list_holdings(user_id=uid, account_id=acct)
+    assert [(r["symbol"], r["quantity"]) for r in rows] == [("AAPL", 5.0), ("MSFT", 2.0)]
+
+    try:
+        services.upsert_holdings(user_id=other, account_id=acct, rows=[{"symbol": "TSLA", "quantity": 1}])
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
@@ -0,0 +1,22 @@
+import pandas as pd
+
+import logic.services as services
+
+
+def test_budget_summary_groups_by_category_and_type(db_engine_and_session):
+    _, _ = db_engine_and_session
+
+    user_id = 3
+    services.save_budget("Salary", "INCOME", 5000.0, pd.Timestamp("2025-01-01"), "jan pay", user_id=user_id)
+    services.save_budget("Rent", "EXPENSE", 1500.0, pd.Timestamp("2025-01-02"), "jan rent", user_id=user_id)
+    services.save_budget("Rent", "EXPENSE", 1500.0, pd.Timestamp("2025-02-02"), "feb rent", user_id=user_id)
+    services.save_budget("Misc", "EXPENSE", 20.0, pd.Timestamp("2025-02-03"), "misc", user_id=user_id)
+    services.save_budget("Rent", "EXPENSE", 999.0, pd.Timestamp("2025-02-02"), "other user", user_id=user_id + 1)
+
+    summary = services.get_budget_summary(user_id=user_id)
+    assert summary["entry_count"] == 4
+    assert summary["total_income"] == 5000.0
+    assert summary["total_expense"] == 3020.0
+    assert summary["net"] == 1980.0
+    assert summary["by_category"] == {"Salary": 5000.0, "Rent": 3000.0, "Misc": 20.0}
+    assert summary["by_type"] == {"INCOME": 5000.0, "EXPENSE": 3020.0}
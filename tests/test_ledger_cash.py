@@ -41,3 +41,36 @@ def test_cash_withdraw_posts_and_updates_balance(db_engine_and_session):
     entries = services.list_ledger_entries(user_id=user_id, limit=10)
     assert len(entries) == 2
     assert {e["entry_type"] for e in entries} == {"CASH_DEPOSIT", "CASH_WITHDRAW"}
+
+
+def test_save_cash_many_posts_one_entry_per_row(db_engine_and_session):
+    _, _ = db_engine_and_session
+
+    user_id = 9
+    ids = services.save_cash_many([
+        {"action": "DEPOSIT", "amount": 100.0, "date": pd.Timestamp("2025-01-01"), "notes": "seed"},
+        {"action": "DEPOSIT", "amount": 50.0, "date": pd.Timestamp("2025-01-02")},
+        {"action": "WITHDRAW", "amount": 30.0, "date": pd.Timestamp("2025-01-03"), "notes": "atm"},
+    ], user_id=user_id)
+    assert len(ids) == 3 and len(set(ids)) == 3
+
+    assert services.get_cash_balance_ledger(user_id=user_id, currency="USD") == 120.0
+
+    entries = services.list_ledger_entries(user_id=user_id, limit=10)
+    assert len(entries) == 3
+    assert {e["source_id"] for e in entries} == set(ids)
+    for e in entries:
+        assert round(sum(float(l["amount"]) for l in e["lines"]), 10) == 0.0
+
+
+def test_ledger_entries_serialise_without_dataframe(db_engine_and_session):
+    from backend_api.utils import dict_records
+
+    user_id = 11
+    cid = services.save_cash("DEPOSIT", 25.0, pd.Timestamp("2025-01-01"), "seed", user_id=user_id)
+
+    recs = dict_records(services.list_ledger_entries(user_id=user_id, limit=10))
+    assert len(recs) == 1
+    assert recs[0]["source_id"] == cid and isinstance(recs[0]["source_id"], int)
+    assert isinstance(recs[0]["created_at"], str)
+    assert len(recs[0]["lines"]) == 2
@@ -305,3 +305,22 @@ def test_symbol_summary_aggregation(db_engine_and_session):
 def test_symbol_summary_empty_for_new_user(db_engine_and_session):
     uid = make_user("ss2")
     assert port.symbol_summary(user_id=uid) == []
+
+
+# ── premium ledger sync ───────────────────────────────────────────────────────
+
+def test_sync_ledger_from_positions_is_idempotent(db_engine_and_session):
+    from logic.holdings import create_holding
+    from logic.premium_ledger import sync_ledger_from_positions
+
+    uid = make_user("pl1")
+    h = create_holding(user_id=uid, data={"symbol": "AAPL", "shares": 100, "cost_basis": 150.0})
+    w = port.get_or_create_week(user_id=uid, for_date=_monday())
+    port.create_position(user_id=uid, week_id=w["id"], data=_pos_body(holding_id=h["id"], premium_in=1.00))
+    port.create_position(user_id=uid, week_id=w["id"], data=_pos_body(holding_id=h["id"], premium_in=2.00, contracts=2))
+
+    first = sync_ledger_from_positions(user_id=uid)
+    second = sync_ledger_from_positions(user_id=uid)
+    assert first["upserted"] == second["upserted"] == 2
+    assert {r["id"] for r in first["rows"]} == {r["id"] for r in second["rows"]}
+    assert sorted(r["premium_sold"] for r in second["rows"]) == pytest.approx([100.0, 400.0])
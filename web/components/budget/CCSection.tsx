@@ -406,8 +406,13 @@ export function CCSection({
                     <div key={isoSunday}
                       className={"group px-3 py-2 transition-colors hover:bg-[var(--surface-2)] " + (isDirty ? "bg-blue-500/5" : "")}
                     >
-                      {/* Row: label + inputs + action */}
-                      <div className="grid grid-cols-[1fr_80px_80px_32px] gap-1 items-center">
+                      {/* Row: label + inputs + action — save once when focus leaves the row,
+                          not on every field blur (tabbing Charged → Paid used to write twice) */}
+                      <div className="grid grid-cols-[1fr_80px_80px_32px] gap-1 items-center"
+                        onBlur={(e) => {
+                          if (isDirty && !e.currentTarget.contains(e.relatedTarget as Node | null)) commitWeekRow(isoSunday);
+                        }}
+                      >
                         {/* Week label + status pill */}
                         <div className="flex flex-col gap-0.5 min-w-0">
                           <span className="text-xs font-medium text-foreground/70 whitespace-nowrap truncate">
@@ -429,7 +434,6 @@ export function CCSection({
                           type="number" step="0.01" min="0"
                           value={local.balance} placeholder="0.00"
                           onChange={(e) => setWeekEdits((p) => ({ ...p, [isoSunday]: { ...getWeekLocal(isoSunday), balance: e.target.value } }))}
-                          onBlur={() => isDirty && commitWeekRow(isoSunday)}
                           onKeyDown={(e) => e.key === "Enter" && commitWeekRow(isoSunday)}
                           className="w-full bg-transparent text-xs text-right text-rose-400 font-semibold tabular-nums outline-none focus:bg-rose-500/10 rounded px-1 py-0.5 placeholder:text-foreground/20"
                         />
@@ -439,7 +443,6 @@ export function CCSection({
                           type="number" step="0.01" min="0"
                           value={local.paid_amount} placeholder="0.00"
                           onChange={(e) => setWeekEdits((p) => ({ ...p, [isoSunday]: { ...getWeekLocal(isoSunday), paid_amount: e.target.value } }))}
-                          onBlur={() => isDirty && commitWeekRow(isoSunday)}
                           onKeyDown={(e) => e.key === "Enter" && commitWeekRow(isoSunday)}
                           className="w-full bg-transparent text-xs text-right text-emerald-400 font-semibold tabular-nums outline-none focus:bg-emerald-500/10 rounded px-1 py-0.5 placeholder:text-foreground/20"
                         />
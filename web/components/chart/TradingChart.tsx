@@ -298,6 +298,9 @@ export default function TradingChart({ symbol, earningsDate, gexLevels, initialP
     const sma20vals  = calcSMA(closes, 20);
     const sma50vals  = calcSMA(closes, 50);
     const sma200vals = calcSMA(closes, 200);
+    // time → bar index, built once so crosshair moves are a Map lookup
+    // instead of re-parsing every bar date with findIndex on each mouse move
+    const barIdxByTime = new Map<number, number>(bars.map((b, i) => [toChartTime(b.date) as number, i]));
 
     chart.subscribeCrosshairMove((param) => {
       if (!param.time || !param.seriesData) {
@@ -307,7 +310,7 @@ export default function TradingChart({ symbol, earningsDate, gexLevels, initialP
       // eslint-disable-next-line @typescript-eslint/no-explicit-any
       const d = param.seriesData.get(seriesRef.current) as any;
       if (!d) return;
-      const idx = bars.findIndex(b => toChartTime(b.date) === param.time);
+      const idx = barIdxByTime.get(param.time as number) ?? -1;
       const bar = bars[idx];
       setLegend({
         time:   bar?.date?.slice(0, 19).replace("T", " "),